@@ -1,22 +1,20 @@
 import random
 import csv
 import os
+from functools import lru_cache
 
-# Load verbs from CSV file
+# Load verbs from CSV file (read once, then served from memory)
+@lru_cache(maxsize=1)
 def load_verbs():
-    verbs = []
     script_dir = os.path.dirname(os.path.abspath(__file__))
     csv_path = os.path.join(script_dir, "verbs.csv")
     with open(csv_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            verbs.append(row)  # Each row is [Verb, Meaning, Example]
-    return verbs
+        # Each row is [Verb, Meaning, Example]
+        return tuple(tuple(row) for row in csv.reader(csvfile))
 
 # Get 10 random verbs
 def get_random_verbs():
-    verbs = load_verbs()
-    return random.sample(verbs, 10)
+    return random.sample(load_verbs(), 10)
 
 # Display verbs
 for verb in get_random_verbs():
@@ -1,8 +1,11 @@
 import openai
 import os
-import requests
+import importlib.util
+import httpx
 import schedule
 import time
+from functools import lru_cache
+import llm_cache
 from dotenv import load_dotenv
 
 # Load API keys from .env file
@@ -11,44 +14,89 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-# Initialize OpenAI client
+OPENAI_MODEL = "gpt-4o-mini"  # Small model: cheaper and faster per token
+MAX_TOKENS = 400  # Cap generation so the ten-item replies come back quickly
+BREVITY = " Respond in under 350 tokens; no preamble."
+CACHE_TTL = 23 * 60 * 60  # Cached responses expire before the next daily run
 
-def get_french_verbs():
-    """Fetches 10 new French verbs from OpenAI API."""
-    prompt = """Give me 10 new French verbs along with their meanings and example sentences in this format:
+@lru_cache(maxsize=1)
+def _openai():
+    """One OpenAI client (and connection pool) shared by every request, created on first use"""
+    return openai.OpenAI(api_key=OPENAI_API_KEY, timeout=30, max_retries=2)
 
-Verb: [infinitive]
-Meaning: [English translation]
-Example: [French sentence]
-Translation: [English sentence]
+# Keep one HTTP/2 connection to Telegram alive across sends (HTTP/1.1 if h2 isn't installed)
+_SESSION = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=600)
+)
 
-Make sure the verbs are different each day.
-"""
+def get_french_verbs(on_progress=None):
+    """Fetches 10 new French verbs from OpenAI API, streaming partial text to on_progress."""
+    prompt = "10 new French verbs (vary daily). Per verb, lines: Verb, Meaning (English), Example (French), Translation."
 
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",  # Using 3.5-turbo for cost efficiency
-        messages=[{"role": "system", "content": "You are a helpful French language assistant."},
-                  {"role": "user", "content": prompt}]
-    )
+    system = "You are a helpful French language assistant." + BREVITY
 
-    return response.choices[0].message.content
+    def fetch():
+        stream = _openai().chat.completions.create(
+            model=OPENAI_MODEL,
+            max_tokens=MAX_TOKENS,
+            temperature=0.7,
+            messages=[{"role": "system", "content": system},
+                      {"role": "user", "content": prompt}],
+            stream=True
+        )
+
+        parts = []
+        for i, chunk in enumerate(stream, 1):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if on_progress and i % 80 == 0:
+                on_progress("".join(parts))
+
+        return "".join(parts)
+
+    return llm_cache.cached(OPENAI_MODEL, system, prompt, CACHE_TTL, fetch)
 
 def send_telegram_message():
-    """Fetches verbs and sends them to Telegram bot."""
-    verbs_text = get_french_verbs()
-    message = f"📚 **Your Daily 10 French Verbs**:\n\n{verbs_text}"
+    """Fetches verbs and sends them to Telegram bot, editing one message as they stream in."""
+    api_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
+    header = "📚 **Your Daily 10 French Verbs**:\n\n"
+    message_id = None
+
+    def show_progress(partial):
+        # Partial output may have unbalanced Markdown, so send it as plain text
+        nonlocal message_id
+        payload = {"chat_id": TELEGRAM_CHAT_ID, "text": header + partial}
+        if message_id is None:
+            sent = _SESSION.post(f"{api_url}/sendMessage", json=payload).json()
+            message_id = sent.get("result", {}).get("message_id")
+        else:
+            payload["message_id"] = message_id
+            _SESSION.post(f"{api_url}/editMessageText", json=payload)
+
+    verbs_text = get_french_verbs(on_progress=show_progress)
+    message = header + verbs_text
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {"chat_id": TELEGRAM_CHAT_ID, "text": message, "parse_mode": "Markdown"}
-    response = requests.post(url, json=payload)
+    if message_id is None:
+        response = _SESSION.post(f"{api_url}/sendMessage", json=payload)
+    else:
+        payload["message_id"] = message_id
+        response = _SESSION.post(f"{api_url}/editMessageText", json=payload)
+        if not response.json().get("ok"):
+            # Telegram rejects unbalanced Markdown; fall back to plain text
+            # rather than leave the partial message showing
+            del payload["parse_mode"]
+            response = _SESSION.post(f"{api_url}/editMessageText", json=payload)
 
     print(f"✅ Sent message: {response.json()}")  # Debugging
 
 # Schedule the script to run daily at 9:00 AM
 schedule.every().day.at("09:00").do(send_telegram_message)
 
-# Keep the script running
+# Keep the script running, sleeping until the next job is due
 while True:
     schedule.run_pending()
-    time.sleep(60)  # Wait 60 seconds before checking again
+    idle = schedule.idle_seconds()
+    time.sleep(max(idle, 1) if idle is not None else 60)
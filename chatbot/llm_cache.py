@@ -0,0 +1,48 @@
+"""
+On-disk cache for OpenAI responses used by the French bots.
+
+Responses are stored in a small sqlite database keyed by
+SHA256(model|system|prompt) so repeated prompts skip the API call.
+"""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+CACHE_FILE = Path(__file__).with_name("llm_cache.sqlite3")
+
+
+def make_key(model, system, prompt):
+    """Build the cache key for one chat completion request"""
+    return hashlib.sha256(f"{model}|{system}|{prompt}".encode("utf-8")).hexdigest()
+
+
+def _connect():
+    conn = sqlite3.connect(CACHE_FILE)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, ts INTEGER)")
+    return conn
+
+
+def cached(model, system, prompt, ttl, fetch):
+    """Return the cached response for this prompt, calling fetch() on a miss or when stale"""
+    key = make_key(model, system, prompt)
+    try:
+        with closing(_connect()) as conn, conn:
+            row = conn.execute("SELECT value FROM responses WHERE key = ? AND ts > ?",
+                               (key, int(time.time()) - ttl)).fetchone()
+        if row:
+            return row[0]
+    except sqlite3.Error as e:
+        print(f"Error reading response cache: {str(e)}")
+
+    value = fetch()
+    if value:
+        try:
+            with closing(_connect()) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO responses (key, value, ts) VALUES (?, ?, ?)",
+                             (key, value, int(time.time())))
+        except sqlite3.Error as e:
+            print(f"Error writing response cache: {str(e)}")
+    return value
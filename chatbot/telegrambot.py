@@ -1,12 +1,23 @@
 import openai
-import requests
+import importlib.util
+import httpx
 import json
+import re
 import datetime
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 import schedule
 import time
+from functools import lru_cache
+import llm_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -16,64 +27,165 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
-def get_daily_content():
-    """Rotate between different types of French learning content"""
-    day = datetime.datetime.now().weekday()
+OPENAI_MODEL = "gpt-4o-mini"  # Small model: cheaper and faster per token
+MAX_TOKENS = 400  # Cap generation so the ten-item replies come back quickly
+BREVITY = " Respond in under 350 tokens; no preamble."
+CACHE_TTL = 23 * 60 * 60  # Cached responses expire before the next daily run
+
+PROGRESS_FILE = Path("french_progress.json")
+HISTORY_FILE = Path("french_history.jsonl")  # One {"date", "vocab"} record per line
+RECENT_DAYS = 7  # Days of vocabulary covered by the weekly quiz
 
-    prompts = {
-        0: "Give me 10 common French phrases used in daily conversation with meanings and examples.",
-        1: "Provide 10 French verbs with conjugations in present tense and example sentences.",
-        2: "Share 10 French adjectives with their feminine/masculine forms and example usage.",
-        3: "List 10 French idioms with their literal translations and actual meanings.",
-        4: "Give me 10 French food-related vocabulary words with example dialogues.",
-        5: "Provide 10 French business/professional terms with examples.",
-        6: "Share 10 French slang expressions with their meanings and when to use them."
-    }
+# Quiz produced together with Sunday's vocabulary, sent by the 10:00 job
+_pending_quiz = None
 
-    return prompts[day]
+@lru_cache(maxsize=1)
+def _openai():
+    """One OpenAI client (and connection pool) shared by every request, created on first use"""
+    return openai.OpenAI(api_key=OPENAI_API_KEY, timeout=30, max_retries=2)
 
-def get_french_vocab():
+# Keep one HTTP/2 connection to Telegram alive across sends (HTTP/1.1 if h2 isn't installed)
+_SESSION = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=600)
+)
+
+# Daily content prompts, indexed by weekday (Monday = 0)
+DAILY_PROMPTS = (
+    "Give me 10 common French phrases used in daily conversation with meanings and examples.",
+    "Provide 10 French verbs with conjugations in present tense and example sentences.",
+    "Share 10 French adjectives with their feminine/masculine forms and example usage.",
+    "List 10 French idioms with their literal translations and actual meanings.",
+    "Give me 10 French food-related vocabulary words with example dialogues.",
+    "Provide 10 French business/professional terms with examples.",
+    "Share 10 French slang expressions with their meanings and when to use them."
+)
+
+def get_daily_content(day=None):
+    """Rotate between different types of French learning content"""
+    return DAILY_PROMPTS[datetime.date.today().weekday() if day is None else day]
+
+def collect_stream(stream, on_progress=None, every=80):
+    """Join a streamed completion, reporting the partial text every few chunks"""
+    parts = []
+    for i, chunk in enumerate(stream, 1):
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+        if on_progress and i % every == 0:
+            on_progress("".join(parts))
+    return "".join(parts)
+
+def get_french_vocab(on_progress=None):
     """Get French vocabulary from OpenAI API"""
     try:
         prompt = get_daily_content()  # Get the day-specific prompt
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",  # Using 3.5-turbo for cost efficiency
-            messages=[
-                {"role": "system", "content": "You are a French language tutor."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        system = "You are a French language tutor." + BREVITY
 
-        vocab = response.choices[0].message.content
+        def fetch():
+            stream = _openai().chat.completions.create(
+                model=OPENAI_MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=0.7,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True
+            )
+            return collect_stream(stream, on_progress)
+
+        vocab = llm_cache.cached(OPENAI_MODEL, system, prompt, CACHE_TTL, fetch)
         return vocab
     except Exception as e:
         print(f"Error getting vocabulary: {str(e)}")
         return None
 
-def send_telegram_message(text):
-    """Send vocabulary via Telegram bot"""
+def send_telegram_message(text, parse_mode="Markdown"):
+    """Send vocabulary via Telegram bot, returning the new message id"""
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
         payload = {
             "chat_id": TELEGRAM_CHAT_ID,
-            "text": f"🇫🇷 Your French Vocabulary for {datetime.date.today().strftime('%B %d, %Y')} 🇫🇷\n\n{text}",
-            "parse_mode": "Markdown"
+            "text": f"🇫🇷 Your French Vocabulary for {datetime.date.today().strftime('%B %d, %Y')} 🇫🇷\n\n{text}"
         }
-        response = requests.post(url, json=payload)
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        response = _SESSION.post(url, json=payload)
         response.raise_for_status()
         print("Vocabulary sent successfully!")
-        return True
+        return response.json()["result"]["message_id"]
     except Exception as e:
         print(f"Error sending message: {str(e)}")
         return False
 
+def edit_telegram_message(message_id, text, parse_mode="Markdown"):
+    """Replace the text of a message sent earlier"""
+    try:
+        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/editMessageText"
+        payload = {
+            "chat_id": TELEGRAM_CHAT_ID,
+            "message_id": message_id,
+            "text": f"🇫🇷 Your French Vocabulary for {datetime.date.today().strftime('%B %d, %Y')} 🇫🇷\n\n{text}"
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        response = _SESSION.post(url, json=payload)
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"Error editing message: {str(e)}")
+        return False
+
+def send_chat_action(action="typing"):
+    """Show a chat action such as "typing" while content is being prepared"""
+    try:
+        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendChatAction"
+        _SESSION.post(url, json={"chat_id": TELEGRAM_CHAT_ID, "action": action})
+    except Exception as e:
+        print(f"Error sending chat action: {str(e)}")
+
 def daily_task():
     """Daily task to send vocabulary"""
     print(f"\nSending vocabulary for {datetime.date.today().strftime('%B %d, %Y')}...")
-    vocab = get_french_vocab()
-    if vocab:
-        send_telegram_message(vocab)
+    # Overlap the typing indicator and the progress write with the OpenAI request and send
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(send_chat_action, "typing")
+        vocab, message_id = get_todays_vocab()
+        if vocab:
+            pool.submit(save_progress, vocab)
+            if message_id:
+                # Telegram rejects unbalanced Markdown; fall back to plain text
+                # rather than leave the partial message showing
+                if not edit_telegram_message(message_id, vocab):
+                    edit_telegram_message(message_id, vocab, parse_mode=None)
+            else:
+                send_telegram_message(vocab)
+
+def get_todays_vocab():
+    """Get today's vocabulary, returning it with the id of any message that showed it streaming in"""
+    global _pending_quiz
+    message_id = None
+    collect_weekly_batch()
+
+    def show_progress(partial):
+        # Partial output may have unbalanced Markdown, so send it as plain text
+        nonlocal message_id
+        if message_id is None:
+            # send_telegram_message returns False on failure; try again on the next chunk
+            message_id = send_telegram_message(partial, parse_mode=None) or None
+        else:
+            edit_telegram_message(message_id, partial, parse_mode=None)
+
+    prepared = pop_prepared_vocab()
+    if prepared:
+        vocab = prepared
+    elif datetime.date.today().weekday() == 6:
+        # Sunday: fetch the vocabulary and the weekly quiz in one request
+        vocab, _pending_quiz = get_vocab_and_quiz()
+    else:
+        vocab = get_french_vocab(on_progress=show_progress)
+    return vocab, message_id
 
 def run_scheduler():
     """Run the scheduler"""
@@ -84,7 +196,10 @@ def run_scheduler():
     schedule.every().day.at("09:00").do(daily_task)
 
     # Schedule weekly quiz
-    schedule.every().sunday.at("10:00").do(lambda: send_telegram_message(generate_quiz()))
+    schedule.every().sunday.at("10:00").do(send_weekly_quiz)
+
+    # Queue next week's vocabulary on the Batch API
+    schedule.every().sunday.at("20:00").do(submit_weekly_batch)
 
     # Schedule weekly progress report
     schedule.every().saturday.at("18:00").do(send_progress_report)
@@ -92,38 +207,96 @@ def run_scheduler():
     print("\nScheduler is running. Will send:")
     print("- Daily vocabulary at 09:00")
     print("- Weekly quiz on Sundays at 10:00")
+    print("- Next week's vocabulary queued on Sundays at 20:00")
     print("- Progress report on Saturdays at 18:00")
     print("Press Ctrl+C to stop")
 
+    # Sleep until the next job is due instead of polling every minute
     while True:
         schedule.run_pending()
-        time.sleep(60)
+        idle = schedule.idle_seconds()
+        time.sleep(max(idle, 1) if idle is not None else 60)
+
+def json_dumps(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def json_loads(raw):
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def append_history(day, vocab):
+    """Append one day's vocabulary to the history log"""
+    with open(HISTORY_FILE, 'ab') as f:
+        f.write(json_dumps({"date": day, "vocab": vocab}) + b"\n")
+
+def read_recent_history(count):
+    """Return the last `count` history records, oldest first"""
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, 'rb') as f:
+        return [json_loads(line) for line in deque(f, maxlen=count)]
+
+def load_progress():
+    """Load saved progress counters, or a fresh record if nothing was saved yet"""
+    if not PROGRESS_FILE.exists():
+        return {"words_learned": 0, "days_streak": 0}
+
+    with open(PROGRESS_FILE, 'rb') as f:
+        data = json_loads(f.read())
+
+    # Older files kept the whole history inline; move it to the history log once
+    history = data.pop("history", None)
+    if history is not None:
+        for day, vocab in history.items():
+            append_history(day, vocab)
+        write_progress(data)
+    return data
+
+def write_progress(data):
+    """Write the progress counters back to disk"""
+    # Write a temp file and swap it in, so a crash never leaves a half-written file
+    tmp_path = PROGRESS_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(json_dumps(data, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, PROGRESS_FILE)
 
 def save_progress(vocab):
     """Save vocabulary and track progress"""
     try:
-        file_path = Path("french_progress.json")
         today = datetime.date.today().isoformat()
+        data = load_progress()
 
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        # Update streak
+        yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+        if "last_date" not in data:
+            # Files written before last_date existed: take it from the history log once
+            last = read_recent_history(1)
+            data["last_date"] = last[0]["date"] if last else None
+        if data["last_date"] == today:
+            # Already saved today (e.g. the bot was restarted); don't count it twice
+            return data
+        if data["last_date"] == yesterday:
+            data["days_streak"] += 1
         else:
-            data = {"words_learned": 0, "days_streak": 0, "history": {}}
+            data["days_streak"] = 1
+        data["last_date"] = today
 
         # Update progress
         data["words_learned"] += 10
-        data["history"][today] = vocab
+        append_history(today, vocab)
 
-        # Update streak
-        yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
-        if yesterday in data["history"]:
-            data["days_streak"] += 1
+        # Keep the last week of vocabulary inline so the quiz never reads the history log
+        if "recent" not in data:
+            data["recent"] = [entry["vocab"] for entry in read_recent_history(RECENT_DAYS)]
         else:
-            data["days_streak"] = 1
+            data["recent"] = (data["recent"] + [vocab])[-RECENT_DAYS:]
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        write_progress(data)
 
         return data
     except Exception as e:
@@ -133,8 +306,8 @@ def save_progress(vocab):
 def send_progress_report():
     """Send weekly progress report"""
     try:
-        with open('french_progress.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(PROGRESS_FILE, 'rb') as f:
+            data = json_loads(f.read())
 
         report = f"""📊 *Weekly Progress Report*
 Words Learned: {data['words_learned']}
@@ -145,36 +318,188 @@ Keep up the great work! 🎯"""
     except Exception as e:
         print(f"Error sending progress report: {str(e)}")
 
+def build_quiz_prompt(also_on=None):
+    """
+    Build the quiz prompt from the last week of saved vocabulary.
+
+    also_on describes more words to cover that are not saved yet, such as
+    today's vocabulary requested in the same prompt.
+    """
+    # Get recent words from the rolling window kept by save_progress
+    recent_words = load_progress().get("recent", [])
+    if not recent_words and not also_on:
+        raise ValueError("No vocabulary history to build a quiz from yet")
+
+    topic = " and ".join(str(part) for part in (recent_words, also_on) if part)
+    return (f"5-question multiple-choice quiz (mix translation, fill-in-blank, usage) on: {topic}. "
+            'Return JSON: {"questions":[{"q":str,"options":[4 str],"answer":"a-d"}]}')
+
+def format_quiz(raw):
+    """Turn the quiz JSON returned by OpenAI into the message sent on Telegram"""
+    try:
+        # Models sometimes wrap JSON in a code fence when not in JSON mode
+        questions = json_loads(raw.strip().strip("`").removeprefix("json"))["questions"]
+
+        lines = []
+        for number, question in enumerate(questions, 1):
+            lines.append(f"Q{number}. {question['q']}")
+            lines.extend(f"{letter}) {option}" for letter, option in zip("abcd", question["options"]))
+            lines.append(f"Correct: {question['answer']}\n")
+        return "\n".join(lines).strip()
+    except (ValueError, KeyError, TypeError):
+        # Not the expected shape; send the model's text as it is
+        return raw
+
+def get_vocab_and_quiz():
+    """Get today's vocabulary and the weekly quiz from a single OpenAI request"""
+    try:
+        prompt = f"""Produce TWO sections separated by a line containing only ===.
+Section 1: {get_daily_content()}
+Section 2: {build_quiz_prompt(also_on="the words in Section 1")}"""
+        system = "You are a French language tutor."
+
+        def fetch():
+            response = _openai().chat.completions.create(
+                model=OPENAI_MODEL,
+                max_tokens=2 * MAX_TOKENS,
+                temperature=0.7,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return response.choices[0].message.content
+
+        text = llm_cache.cached(OPENAI_MODEL, system, prompt, CACHE_TTL, fetch)
+        sections = [s.strip() for s in re.split(r"^===\s*$", text, flags=re.M)]
+        if len(sections) < 2:
+            return text, None
+        return sections[0], format_quiz(sections[1])
+    except Exception as e:
+        print(f"Error getting vocabulary and quiz: {str(e)}")
+        # Fall back to the separate requests
+        return get_french_vocab(), None
+
+def submit_weekly_batch():
+    """Queue the next seven days of vocabulary on the OpenAI Batch API"""
+    try:
+        system = "You are a French language tutor." + BREVITY
+        start = datetime.date.today() + datetime.timedelta(days=1)
+        lines = []
+        for offset in range(7):
+            day = start + datetime.timedelta(days=offset)
+            lines.append(json.dumps({
+                "custom_id": day.isoformat(),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": OPENAI_MODEL,
+                    "max_tokens": MAX_TOKENS,
+                    "temperature": 0.7,
+                    "messages": [
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": get_daily_content(day.weekday())}
+                    ]
+                }
+            }, ensure_ascii=False))
+
+        batch_file = _openai().files.create(
+            file=("weekly_vocab.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = _openai().batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        data = load_progress()
+        data["pending_batch"] = batch.id
+        write_progress(data)
+        print(f"Queued next week's vocabulary (batch {batch.id})")
+        return batch.id
+    except Exception as e:
+        print(f"Error queueing weekly batch: {str(e)}")
+        return None
+
+def collect_weekly_batch():
+    """Store the results of a finished weekly batch, keyed by date"""
+    try:
+        data = load_progress()
+        batch_id = data.get("pending_batch")
+        if not batch_id:
+            return False
+
+        batch = _openai().batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            print(f"Weekly batch {batch_id} {batch.status}; using live requests")
+            del data["pending_batch"]
+            write_progress(data)
+            return False
+        if batch.status != "completed":
+            return False
+
+        prepared = data.setdefault("prepared", {})
+        for line in _openai().files.content(batch.output_file_id).text.splitlines():
+            result = json.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            if body.get("choices"):
+                prepared[result["custom_id"]] = body["choices"][0]["message"]["content"]
+        del data["pending_batch"]
+        write_progress(data)
+        return True
+    except Exception as e:
+        print(f"Error collecting weekly batch: {str(e)}")
+        return False
+
+def pop_prepared_vocab():
+    """Take today's pre-generated vocabulary out of the progress file, if any"""
+    try:
+        data = load_progress()
+        prepared = data.get("prepared", {})
+        today = datetime.date.today().isoformat()
+        vocab = prepared.pop(today, None)
+
+        # Drop entries for days the bot was not running
+        stale = [day for day in prepared if day < today]
+        for day in stale:
+            del prepared[day]
+
+        if vocab or stale:
+            write_progress(data)
+        return vocab
+    except Exception as e:
+        print(f"Error reading prepared vocabulary: {str(e)}")
+        return None
+
+def send_weekly_quiz():
+    """Send the weekly quiz, generating it now if it was not prepared with today's vocabulary"""
+    global _pending_quiz
+    quiz = _pending_quiz or generate_quiz()
+    _pending_quiz = None
+    if quiz:
+        send_telegram_message(quiz)
+
 def generate_quiz():
     """Generate a quiz from recent vocabulary"""
     try:
-        with open('french_progress.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Get recent words from history
-        recent_words = list(data["history"].values())[-7:]  # Last 7 days
-
-        prompt = f"""Create a 5-question quiz using these French words and phrases from the past week: {recent_words}.
-Format as:
-Q1. [Question]
-a) [option]
-b) [option]
-c) [option]
-d) [option]
-Correct: [letter]
-
-Use a mix of translation, fill-in-blanks, and usage questions."""
-
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a French language tutor."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        prompt = build_quiz_prompt()
+        system = "You are a French language tutor." + BREVITY
+
+        def fetch():
+            response = _openai().chat.completions.create(
+                model=OPENAI_MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=0.7,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
 
-        return response.choices[0].message.content
+        return format_quiz(llm_cache.cached(OPENAI_MODEL, system, prompt, CACHE_TTL, fetch))
     except Exception as e:
         print(f"Error generating quiz: {str(e)}")
         return None
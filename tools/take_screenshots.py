@@ -1,10 +1,19 @@
 import os
 import time
 import argparse
-from PIL import ImageGrab
 from datetime import datetime
 
-def take_screenshot(output_dir, name=None, delay=0):
+try:
+    import mss
+    import mss.tools
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+# zlib level 1 encodes several times faster than PIL's default of 6
+PNG_COMPRESS_LEVEL = 1
+
+def take_screenshot(output_dir, name=None, delay=0, image_format="png"):
     """
     Take a screenshot and save it to the specified directory.
     
@@ -12,6 +21,7 @@ def take_screenshot(output_dir, name=None, delay=0):
         output_dir (str): Directory to save the screenshot
         name (str, optional): Name for the screenshot file. If None, uses timestamp.
         delay (int, optional): Delay in seconds before taking the screenshot.
+        image_format (str, optional): "png" or "webp" (lossless, smaller files).
     
     Returns:
         str: Path to the saved screenshot
@@ -22,21 +32,39 @@ def take_screenshot(output_dir, name=None, delay=0):
     # Wait for the specified delay
     if delay > 0:
         print(f"Taking screenshot in {delay} seconds...")
-        time.sleep(delay)
-    
-    # Take the screenshot
-    screenshot = ImageGrab.grab()
+        # Sleep in short slices so Ctrl+C is handled promptly during long delays
+        deadline = time.monotonic() + delay
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(0.1, remaining))
     
     # Generate filename
     if name is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"screenshot_{timestamp}.png"
+        filename = f"screenshot_{timestamp}.{image_format}"
     else:
-        filename = f"{name}.png"
+        filename = f"{name}.{image_format}"
     
-    # Save the screenshot
+    # Take and save the screenshot
     filepath = os.path.join(output_dir, filename)
-    screenshot.save(filepath)
+    if MSS_AVAILABLE:
+        # mss grabs the native framebuffer and writes the PNG without going through PIL
+        with mss.mss() as sct:
+            raw = sct.grab(sct.monitors[1])
+        if image_format == "png":
+            mss.tools.to_png(raw.rgb, raw.size, level=PNG_COMPRESS_LEVEL, output=filepath)
+            screenshot = None
+        else:
+            from PIL import Image
+            screenshot = Image.frombytes("RGB", raw.size, raw.rgb)
+    else:
+        from PIL import ImageGrab
+        screenshot = ImageGrab.grab()
+
+    if screenshot is not None:
+        if image_format == "webp":
+            screenshot.save(filepath, format="WEBP", lossless=True, quality=80, method=0)
+        else:
+            screenshot.save(filepath, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     print(f"Screenshot saved to: {filepath}")
     
     return filepath
@@ -48,11 +76,13 @@ def main():
     parser.add_argument("--name", "-n", help="Name for the screenshot file")
     parser.add_argument("--delay", "-d", type=int, default=5,
                         help="Delay in seconds before taking the screenshot")
+    parser.add_argument("--format", "-f", choices=["png", "webp"], default="png",
+                        help="Image format (webp is lossless and smaller)")
     
     args = parser.parse_args()
     
     print("Position your application window and get ready...")
-    take_screenshot(args.output, args.name, args.delay)
+    take_screenshot(args.output, args.name, args.delay, args.format)
 
 if __name__ == "__main__":
     main()
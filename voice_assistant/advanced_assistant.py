@@ -13,69 +13,136 @@ import sys
 import threading
 import time
 import json
+import marshal
+import re
 import logging
-import tkinter as tk
+import logging.handlers
+import queue
+import atexit
+import importlib
+import importlib.util
+import concurrent.futures
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 
 # Import the enhanced voice assistant as the base
 import enhanced_voice_assistant as base_assistant
 
-# Import advanced features
+# orjson is optional; it only speeds up reading and writing the configuration
 try:
-    from custom_wake_word import CustomWakeWordDetector as WakeWordDetector, get_available_keywords
-    WAKE_WORD_AVAILABLE = True
+    import orjson
 except ImportError:
+    orjson = None
+
+def _modules_available(*names) -> bool:
+    """Check that modules can be found without actually importing them"""
+    return all(importlib.util.find_spec(name) is not None for name in names)
+
+# Check which advanced features are available. The feature modules pull in
+# heavy dependencies, so they are only imported once a feature is enabled.
+WAKE_WORD_AVAILABLE = _modules_available("custom_wake_word", "pvporcupine", "pyaudio")
+if not WAKE_WORD_AVAILABLE:
     print("Wake word detection not available. Install pvporcupine package.")
-    WAKE_WORD_AVAILABLE = False
 
-try:
-    from gpt_integration import GPTAssistant
-    GPT_AVAILABLE = True
-except ImportError:
+GPT_AVAILABLE = _modules_available("gpt_integration", "openai")
+if not GPT_AVAILABLE:
     print("GPT integration not available. Install openai package.")
-    GPT_AVAILABLE = False
 
-try:
-    from smart_home import SmartHomeController
-    SMART_HOME_AVAILABLE = True
-except ImportError:
+SMART_HOME_AVAILABLE = _modules_available("smart_home", "requests")
+if not SMART_HOME_AVAILABLE:
     print("Smart home control not available.")
-    SMART_HOME_AVAILABLE = False
 
-try:
-    from gui_assistant import AssistantGUI
-    GUI_AVAILABLE = True
-except ImportError:
+GUI_AVAILABLE = _modules_available("gui_assistant", "tkinter", "PIL")
+if not GUI_AVAILABLE:
     print("GUI not available. Install pillow package.")
-    GUI_AVAILABLE = False
 
-try:
-    from system_control import SystemControl
-    from system_commands import get_system_commands
-    SYSTEM_CONTROL_AVAILABLE = True
-except ImportError:
+SYSTEM_CONTROL_AVAILABLE = _modules_available("system_control", "system_commands", "psutil", "pyautogui", "win32api")
+if not SYSTEM_CONTROL_AVAILABLE:
     print("System control not available. Install required packages.")
-    SYSTEM_CONTROL_AVAILABLE = False
 
-# Import voice enhancements
-try:
-    from voice_enhancements import VoiceEnhancements
-    VOICE_ENHANCEMENTS_AVAILABLE = True
-except ImportError:
+VOICE_ENHANCEMENTS_AVAILABLE = _modules_available("voice_enhancements", "custom_wake_word", "advanced_tts")
+if not VOICE_ENHANCEMENTS_AVAILABLE:
     print("Voice enhancements not available. Install required packages.")
-    VOICE_ENHANCEMENTS_AVAILABLE = False
 
-# Configure logging
+# Feature modules imported so far, by name
+_MODS = {}
+
+def _lazy_import(name: str):
+    """Import a feature module on first use"""
+    module = _MODS.get(name)
+    if module is None:
+        module = _MODS[name] = importlib.import_module(name)
+    return module
+
+# Words that count as agreeing to a question
+_AFFIRM = frozenset({"yes", "sure", "yeah", "yep", "ok", "okay"})
+
+def _affirmed(response: Optional[str]) -> bool:
+    """Check whether a spoken answer agrees"""
+    return bool(response) and not _AFFIRM.isdisjoint(response.lower().split())
+
+# Configure logging. The log file is attached by start_file_logging once the
+# assistant starts, so importing this module does not open it.
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("advanced_assistant.log"),
-        logging.StreamHandler()
-    ]
+    format=LOG_FORMAT,
+    handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
+# setup.py precompiles the bytecode; without it and without a writable cache,
+# every feature module is compiled again on each launch
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PYCACHE_DIR = os.path.join(_MODULE_DIR, "__pycache__")
+if not os.access(_PYCACHE_DIR if os.path.isdir(_PYCACHE_DIR) else _MODULE_DIR, os.W_OK):
+    logger.info("Bytecode cache is not writable; run setup.py to precompile the assistant modules")
+
+_log_listener = None
+
+def start_file_logging(path: str = "advanced_assistant.log"):
+    """Write log records to a file from a background thread"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    # Records are only queued by the logging thread; the listener does the
+    # disk writes
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler(path)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# Parsed copy of the advanced configuration, keyed by the JSON file's mtime.
+# It is stored with marshal, which (unlike pickle) cannot run code on load.
+ADVANCED_CONFIG_FILE = "advanced_config.json"
+CONFIG_CACHE_FILE = ADVANCED_CONFIG_FILE + ".cache"
+
+def read_json(path: str) -> Any:
+    """Read a JSON file, using orjson when it is installed"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def write_json(path: str, data: Any):
+    """Write a JSON file atomically, using orjson when it is installed"""
+    if orjson:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        raw = json.dumps(data, indent=4).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Number of GPT answers kept for repeated questions
+GPT_CACHE_SIZE = 512
+
 class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
     """
     Advanced Voice Assistant with additional features
@@ -86,6 +153,7 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
 
         # Load advanced configuration
         self.advanced_config = self.load_advanced_config()
+        start_file_logging()
 
         # Initialize advanced features
         self.wake_word_detector = None
@@ -93,21 +161,40 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
         self.smart_home = None
         self.gui = None
         self.voice_enhancements = None
+        self._gpt_cache = OrderedDict()
+        self._dirty_sections = set()
+        self._ready = threading.Event()
+
+        # Start listening for the wake word first, since that is what the user
+        # waits on, while the other features are still loading
+        wake_thread = None
+        if self.feature_enabled(WAKE_WORD_AVAILABLE, "wake_word"):
+            wake_thread = threading.Thread(target=self.initialize_wake_word, daemon=True)
+            wake_thread.start()
 
         # Initialize available features
-        self.initialize_advanced_features()
+        self.initialize_advanced_features(wake_word=False, wake_thread=wake_thread)
 
         # Add advanced commands
         self.add_advanced_commands()
 
+        self._ready.set()
+
+        # The voice enhancement wake words can share the main detector's stream
+        self.start_enhancement_wake_word()
         logger.info("Advanced Voice Assistant initialized")
 
     def load_advanced_config(self) -> Dict:
         """Load advanced configuration"""
         try:
-            if os.path.exists("advanced_config.json"):
-                with open("advanced_config.json", "r") as f:
-                    return json.load(f)
+            if os.path.exists(ADVANCED_CONFIG_FILE):
+                cached = self.read_config_cache()
+                if cached is not None:
+                    return cached
+
+                config = read_json(ADVANCED_CONFIG_FILE)
+                self.write_config_cache(config)
+                return config
             else:
                 # Create default advanced configuration
                 default_config = {
@@ -150,44 +237,112 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
                     }
                 }
 
-                with open("advanced_config.json", "w") as f:
-                    json.dump(default_config, f, indent=4)
+                write_json(ADVANCED_CONFIG_FILE, default_config)
+                self.write_config_cache(default_config)
 
                 return default_config
         except Exception as e:
             logger.error(f"Error loading advanced configuration: {e}")
             return {}
 
+    def set_config(self, section: str, key: str, value: Any):
+        """Change one advanced setting (key may be a dotted path) and mark its section for saving"""
+        *parents, name = key.split(".")
+        target = self.advanced_config.setdefault(section, {})
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+        self._dirty_sections.add(section)
+
     def save_advanced_config(self):
-        """Save advanced configuration"""
+        """Save the sections changed through set_config"""
         try:
-            with open("advanced_config.json", "w") as f:
-                json.dump(self.advanced_config, f, indent=4)
+            if not self._dirty_sections:
+                return
+
+            # Merge the changed sections into the file so edits made to the
+            # other sections since startup are kept
+            config = read_json(ADVANCED_CONFIG_FILE) if os.path.exists(ADVANCED_CONFIG_FILE) else {}
+            for section in self._dirty_sections:
+                config[section] = self.advanced_config[section]
+            write_json(ADVANCED_CONFIG_FILE, config)
+            self.write_config_cache(config)
+            self._dirty_sections.clear()
             logger.info("Advanced configuration saved")
         except Exception as e:
             logger.error(f"Error saving advanced configuration: {e}")
 
-    def initialize_advanced_features(self):
-        """Initialize all available advanced features"""
-        # Initialize wake word detection
-        if (WAKE_WORD_AVAILABLE and
-            self.advanced_config.get("wake_word", {}).get("enabled", False)):
-            self.initialize_wake_word()
-
-        # Initialize GPT integration
-        if (GPT_AVAILABLE and
-            self.advanced_config.get("gpt", {}).get("enabled", False)):
-            self.initialize_gpt()
-
-        # Initialize smart home control
-        if (SMART_HOME_AVAILABLE and
-            self.advanced_config.get("smart_home", {}).get("enabled", False)):
-            self.initialize_smart_home()
-
-        # Initialize voice enhancements
-        if (VOICE_ENHANCEMENTS_AVAILABLE and
-            self.advanced_config.get("voice_enhancements", {}).get("enabled", False)):
-            self.initialize_voice_enhancements()
+    def read_config_cache(self) -> Optional[Dict]:
+        """Return the cached configuration if it matches the JSON file, else None"""
+        try:
+            with open(CONFIG_CACHE_FILE, "rb") as f:
+                mtime, config = marshal.load(f)
+            if isinstance(config, dict) and mtime == os.stat(ADVANCED_CONFIG_FILE).st_mtime_ns:
+                return config
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return None
+
+    def write_config_cache(self, config: Dict):
+        """Store the parsed configuration next to the JSON file"""
+        try:
+            mtime = os.stat(ADVANCED_CONFIG_FILE).st_mtime_ns
+            with open(CONFIG_CACHE_FILE, "wb") as f:
+                marshal.dump((mtime, config), f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write configuration cache: {e}")
+
+    def feature_enabled(self, available: bool, name: str) -> bool:
+        """Check whether a feature is installed and enabled in the configuration"""
+        return available and self.advanced_config.get(name, {}).get("enabled", False)
+
+    def initialize_advanced_features(self, wake_word: bool = True, wake_thread: Optional[threading.Thread] = None):
+        """
+        Initialize all available advanced features.
+
+        wake_thread is a thread already initializing wake word detection; the
+        other audio features wait for it to finish.
+        """
+        network_features = [
+            (GPT_AVAILABLE, "gpt", self.initialize_gpt),
+            (SMART_HOME_AVAILABLE, "smart_home", self.initialize_smart_home),
+        ]
+        audio_features = [
+            (WAKE_WORD_AVAILABLE and wake_word, "wake_word", self.initialize_wake_word),
+            (VOICE_ENHANCEMENTS_AVAILABLE, "voice_enhancements", self.initialize_voice_enhancements),
+        ]
+
+        # GPT and smart home only wait on network services, so they start side
+        # by side while the audio features load
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(network_features)) as executor:
+            futures = [executor.submit(init) for available, name, init in network_features
+                       if self.feature_enabled(available, name)]
+
+            # PyAudio and the SAPI engine must not be set up from several
+            # threads at once, so the audio features start one at a time here
+            if wake_thread:
+                wake_thread.join()
+            for available, name, init in audio_features:
+                if self.feature_enabled(available, name):
+                    init()
+
+            concurrent.futures.wait(futures)
+
+        if wake_word:
+            self.start_enhancement_wake_word()
+
+    def start_enhancement_wake_word(self):
+        """Start the voice enhancement wake words, on the main detector's audio stream if it is running"""
+        detector = self.voice_enhancements and self.voice_enhancements.wake_word_detector
+        if not detector or detector.is_running:
+            return
+
+        # One microphone stream and reader thread serves both keyword sets
+        if self.wake_word_detector and self.wake_word_detector.is_running:
+            self.wake_word_detector.share_stream(detector)
+            logger.info("Voice enhancement wake words started on the shared audio stream")
+        elif self.voice_enhancements.start_wake_word_detection():
+            logger.info("Voice enhancement wake words started")
 
     def initialize_wake_word(self):
         """Initialize wake word detection"""
@@ -201,6 +356,7 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
                 logger.warning("Wake word detection requires an access key")
                 return
 
+            WakeWordDetector = _lazy_import("custom_wake_word").CustomWakeWordDetector
             self.wake_word_detector = WakeWordDetector(
                 keywords=keywords,
                 access_key=access_key,
@@ -229,6 +385,7 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
                 logger.warning("GPT integration requires an API key")
                 return
 
+            GPTAssistant = _lazy_import("gpt_integration").GPTAssistant
             self.gpt_assistant = GPTAssistant(
                 api_key=api_key,
                 model=model
@@ -245,6 +402,7 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
             smart_home_config = self.advanced_config.get("smart_home", {})
             config_file = smart_home_config.get("config_file", "smart_home_config.json")
 
+            SmartHomeController = _lazy_import("smart_home").SmartHomeController
             self.smart_home = SmartHomeController(config_file=config_file)
 
             # Discover devices
@@ -258,51 +416,46 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
         """Initialize voice enhancements"""
         try:
             voice_config = self.advanced_config.get("voice_enhancements", {})
-
-            # Create a voice enhancements instance
-            self.voice_enhancements = VoiceEnhancements()
-
-            # Configure wake word
             wake_word_config = voice_config.get("wake_word", {})
-            if wake_word_config.get("enabled", True):
-                # Update the wake word configuration
-                self.voice_enhancements.config["wake_word"]["keywords"] = wake_word_config.get("keywords", ["clover"])
-                self.voice_enhancements.config["wake_word"]["sensitivity"] = wake_word_config.get("sensitivity", 0.5)
-                self.voice_enhancements.config["wake_word"]["access_key"] = wake_word_config.get("access_key", "")
+            tts_config = voice_config.get("tts", {})
 
-                # Set the callback function
-                self.voice_enhancements.set_wake_word_callback(self.on_wake_word)
+            # The advanced configuration is the source of truth, so pass it in
+            # directly instead of going through voice_enhancements.json
+            enhancements_config = {
+                "wake_word": {
+                    "enabled": wake_word_config.get("enabled", True),
+                    "keywords": wake_word_config.get("keywords", ["clover"]),
+                    "sensitivity": wake_word_config.get("sensitivity", 0.5),
+                    "access_key": wake_word_config.get("access_key", "")
+                },
+                "tts": {
+                    "engine": tts_config.get("engine", "best"),
+                    "voice_id": tts_config.get("voice_id", ""),
+                    "api_key": tts_config.get("api_key", ""),
+                    "rate": tts_config.get("rate", 150),
+                    "volume": tts_config.get("volume", 1.0),
+                    "pitch": tts_config.get("pitch", 1.0),
+                    "language": tts_config.get("language", "en")
+                }
+            }
 
-            # Configure TTS
-            tts_config = voice_config.get("tts", {})
-            self.voice_enhancements.config["tts"]["engine"] = tts_config.get("engine", "best")
-            self.voice_enhancements.config["tts"]["voice_id"] = tts_config.get("voice_id", "")
-            self.voice_enhancements.config["tts"]["api_key"] = tts_config.get("api_key", "")
-            self.voice_enhancements.config["tts"]["rate"] = tts_config.get("rate", 150)
-            self.voice_enhancements.config["tts"]["volume"] = tts_config.get("volume", 1.0)
-            self.voice_enhancements.config["tts"]["pitch"] = tts_config.get("pitch", 1.0)
-
-            # Save the configuration
-            self.voice_enhancements.save_config()
-
-            # Re-initialize the enhancements with the updated configuration
-            self.voice_enhancements.initialize_enhancements()
-
-            # Start wake word detection if enabled
-            if wake_word_config.get("enabled", True) and wake_word_config.get("access_key", ""):
-                self.voice_enhancements.start_wake_word_detection()
+            # Create a voice enhancements instance
+            VoiceEnhancements = _lazy_import("voice_enhancements").VoiceEnhancements
+            self.voice_enhancements = VoiceEnhancements(config=enhancements_config)
+            self.voice_enhancements.set_wake_word_callback(self.on_wake_word)
+
+            # Wake word detection is started by start_enhancement_wake_word once
+            # the main detector is up, so the two can share one audio stream
+            if self.voice_enhancements.wake_word_detector:
                 logger.info("Voice enhancements initialized with wake word detection")
             else:
                 logger.info("Voice enhancements initialized without wake word detection")
 
-            # Override the speak method to use the advanced TTS
-            self._original_speak = self.speak
-            def enhanced_speak(text):
-                if self.voice_enhancements and self.voice_enhancements.tts_engine:
-                    return self.voice_enhancements.speak(text)
-                else:
-                    return self._original_speak(text)
-            self.speak = enhanced_speak
+            # Speak through the advanced TTS directly. initialize_tts always leaves
+            # an engine in place, falling back to pyttsx3 on errors.
+            if self.voice_enhancements.tts_engine:
+                self._original_speak = self.speak
+                self.speak = self.voice_enhancements.speak
 
         except Exception as e:
             logger.error(f"Error initializing voice enhancements: {e}")
@@ -311,6 +464,10 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
     def on_wake_word(self, keyword):
         """Callback when wake word is detected"""
         logger.info(f"Wake word detected: {keyword}")
+        # The wake word can fire while the other features are still starting.
+        # Wait for them, so speaking and listening do not set up audio
+        # alongside them and self.speak is not swapped partway through.
+        self._ready.wait()
         self.speak("I'm listening")
 
         # Process a command
@@ -318,43 +475,67 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
         if query:
             self.process_command(query)
 
+    def get_gpt_response(self, query: str) -> Optional[str]:
+        """Ask GPT, reusing the answer to an identical earlier question"""
+        key = (self.gpt_assistant.model, query.lower().strip())
+        response = self._gpt_cache.get(key)
+        if response is not None:
+            self._gpt_cache.move_to_end(key)
+            return response
+
+        response = self.gpt_assistant.get_response(query)
+        if response:
+            self._gpt_cache[key] = response
+            if len(self._gpt_cache) > GPT_CACHE_SIZE:
+                self._gpt_cache.popitem(last=False)
+        return response
+
     def add_advanced_commands(self):
         """Add commands for advanced features"""
+        self._gpt_fallback_idx = None
+
         # Add GPT command if available
         if self.gpt_assistant:
             from enhanced_voice_assistant import Command
 
             class GPTCommand(Command):
                 """Use GPT for natural language conversation"""
+                # Never matched directly, only used as the fallback
+                triggers = ()
+
                 def __init__(self, assistant):
                     super().__init__(assistant)
 
-                def matches(self, query: str) -> bool:
+                def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
                     # This is a fallback command, so it should match when no other command does
                     # The actual matching is done in the process_command method
                     return False
 
                 def execute(self, query: str) -> bool:
-                    response = self.assistant.gpt_assistant.get_response(query)
+                    response = self.assistant.get_gpt_response(query)
                     if response:
                         self.assistant.speak(response)
                         return True
                     return False
 
-            # Add the GPT command to the end of the list
+            # Add the GPT command and remember where it is for the fallback
+            self._gpt_fallback_idx = len(self.commands)
             self.commands.append(GPTCommand(self))
 
             # Also add a specific command to chat with GPT
             class ChatGPTCommand(Command):
                 """Explicitly chat with GPT"""
-                def matches(self, query: str) -> bool:
-                    return "chat" in query and ("gpt" in query or "ai" in query)
+                triggers = ("chat",)
+
+                def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
+                    tokens = tokens or base_assistant.query_tokens(query)
+                    return "chatgpt" in tokens or ("chat" in tokens and not tokens.isdisjoint(("gpt", "ai")))
 
                 def execute(self, query: str) -> bool:
                     self.assistant.speak("What would you like to chat about?")
                     chat_query = self.assistant.take_command()
                     if chat_query:
-                        response = self.assistant.gpt_assistant.get_response(chat_query)
+                        response = self.assistant.get_gpt_response(chat_query)
                         if response:
                             self.assistant.speak(response)
                             return True
@@ -368,30 +549,19 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
 
             class SmartHomeCommand(Command):
                 """Control smart home devices"""
-                def matches(self, query: str) -> bool:
-                    return ("turn" in query or "switch" in query or
-                            "light" in query or "device" in query)
+                triggers = ("turn", "switch", "light", "device")
+                _WORDS = frozenset({"turn", "switch", "light", "lights", "device", "devices"})
+                # "turn on the kitchen light" -> ("on", "the kitchen light")
+                _PAT = re.compile(r"\b(?:turn|switch)\s+(on|off)\s+(.+)$")
+
+                def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
+                    return not self._WORDS.isdisjoint(tokens or base_assistant.query_tokens(query))
 
                 def execute(self, query: str) -> bool:
-                    # Extract device and command
-                    device = None
-                    command = None
-
-                    # Check for "turn on/off" commands
-                    if "turn on" in query or "switch on" in query:
-                        command = "on"
-                        # Extract device name (after "turn on" or "switch on")
-                        if "turn on" in query:
-                            device = query.split("turn on")[1].strip()
-                        else:
-                            device = query.split("switch on")[1].strip()
-                    elif "turn off" in query or "switch off" in query:
-                        command = "off"
-                        # Extract device name (after "turn off" or "switch off")
-                        if "turn off" in query:
-                            device = query.split("turn off")[1].strip()
-                        else:
-                            device = query.split("switch off")[1].strip()
+                    # Extract command and device from "turn/switch on/off <device>"
+                    match = self._PAT.search(query)
+                    command, device = match.groups() if match else (None, None)
+                    device = device and device.strip()
 
                     if not device or not command:
                         self.assistant.speak("I'm not sure which device you want to control")
@@ -411,25 +581,37 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
 
         # Add system control commands if available
         if SYSTEM_CONTROL_AVAILABLE:
-            # Add all system commands
-            system_commands = get_system_commands(self)
+            # Add all system commands. Each one is only created the first time
+            # one of its trigger phrases is heard.
+            try:
+                system_module = _lazy_import("system_commands")
+                system_commands = [system_module.LazyCommand(self, factory)
+                                   for factory in system_module.get_system_command_index().values()]
+            except ImportError as e:
+                logger.error(f"Error loading system control commands: {e}")
+                system_commands = []
             for command in system_commands:
                 self.commands.append(command)
             logger.info(f"Added {len(system_commands)} system control commands")
 
+        self.build_command_router()
+
     def process_command(self, query: str) -> None:
         """Process user commands with advanced features"""
         try:
-            # First try the base commands
-            for command in self.commands[:-1]:  # Exclude the GPT fallback command
-                if command.matches(query):
+            # First try the commands whose trigger phrases appear in the query.
+            # The GPT fallback has no triggers, so it is never routed here.
+            tokens = base_assistant.query_tokens(query)
+            for index in self.route_command(query):
+                command = self.commands[index]
+                if command.matches(query, tokens):
                     if command.execute(query):
                         return
 
             # If no command matched and GPT is enabled for unknown commands, use GPT
-            if (self.gpt_assistant and
+            if (self._gpt_fallback_idx is not None and
                 self.advanced_config.get("gpt", {}).get("use_for_unknown_commands", True)):
-                gpt_command = self.commands[-1]  # The GPT command should be the last one
+                gpt_command = self.commands[self._gpt_fallback_idx]
                 if gpt_command.execute(query):
                     return
 
@@ -447,8 +629,12 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
             return self.run()
 
         try:
+            import tkinter as tk
+            AssistantGUI = _lazy_import("gui_assistant").AssistantGUI
             root = tk.Tk()
-            self.gui = AssistantGUI(root)
+            # Let the GUI drive this assistant instead of starting a basic one;
+            # listening and commands run on its worker thread
+            self.gui = AssistantGUI(root, assistant=self)
             root.mainloop()
         except Exception as e:
             logger.error(f"Error running GUI: {e}")
@@ -462,112 +648,108 @@ class AdvancedVoiceAssistant(base_assistant.VoiceAssistant):
         if WAKE_WORD_AVAILABLE:
             self.speak("Would you like to enable wake word detection?")
             response = self.take_command()
-            if response and ("yes" in response.lower() or "sure" in response.lower()):
-                self.advanced_config["wake_word"]["enabled"] = True
+            if _affirmed(response):
+                self.set_config("wake_word", "enabled", True)
 
                 self.speak("Please enter your Picovoice access key in the console")
                 access_key = input("Picovoice access key: ")
-                self.advanced_config["wake_word"]["access_key"] = access_key
+                self.set_config("wake_word", "access_key", access_key)
 
                 self.speak("What wake words would you like to use? Options include jarvis, computer, alexa, and others.")
                 wake_word_response = self.take_command()
                 if wake_word_response:
-                    keywords = []
-                    for keyword in get_available_keywords():
-                        if keyword in wake_word_response.lower():
-                            keywords.append(keyword)
+                    spoken = wake_word_response.lower()
+                    get_available_keywords = _lazy_import("custom_wake_word").get_available_keywords
+                    keywords = [keyword for keyword in get_available_keywords() if keyword in spoken]
 
                     if keywords:
-                        self.advanced_config["wake_word"]["keywords"] = keywords
+                        self.set_config("wake_word", "keywords", keywords)
                         self.speak(f"Wake words set to: {', '.join(keywords)}")
                     else:
-                        self.advanced_config["wake_word"]["keywords"] = ["jarvis"]
+                        self.set_config("wake_word", "keywords", ["jarvis"])
                         self.speak("Using default wake word: jarvis")
             else:
-                self.advanced_config["wake_word"]["enabled"] = False
+                self.set_config("wake_word", "enabled", False)
 
         # Configure GPT integration
         if GPT_AVAILABLE:
             self.speak("Would you like to enable GPT integration for more natural conversations?")
             response = self.take_command()
-            if response and ("yes" in response.lower() or "sure" in response.lower()):
-                self.advanced_config["gpt"]["enabled"] = True
+            if _affirmed(response):
+                self.set_config("gpt", "enabled", True)
 
                 self.speak("Please enter your OpenAI API key in the console")
                 api_key = input("OpenAI API key: ")
-                self.advanced_config["gpt"]["api_key"] = api_key
+                self.set_config("gpt", "api_key", api_key)
 
                 self.speak("Would you like to use GPT for commands that I don't understand?")
                 fallback_response = self.take_command()
                 if fallback_response:
-                    self.advanced_config["gpt"]["use_for_unknown_commands"] = (
-                        "yes" in fallback_response.lower() or
-                        "sure" in fallback_response.lower()
-                    )
+                    self.set_config("gpt", "use_for_unknown_commands", _affirmed(fallback_response))
             else:
-                self.advanced_config["gpt"]["enabled"] = False
+                self.set_config("gpt", "enabled", False)
 
         # Configure smart home
         if SMART_HOME_AVAILABLE:
             self.speak("Would you like to enable smart home control?")
             response = self.take_command()
-            if response and ("yes" in response.lower() or "sure" in response.lower()):
-                self.advanced_config["smart_home"]["enabled"] = True
+            if _affirmed(response):
+                self.set_config("smart_home", "enabled", True)
                 self.speak("Smart home control enabled. You'll need to configure your devices in the smart home configuration file.")
             else:
-                self.advanced_config["smart_home"]["enabled"] = False
+                self.set_config("smart_home", "enabled", False)
 
         # Configure voice enhancements
         if VOICE_ENHANCEMENTS_AVAILABLE:
             self.speak("Would you like to enable voice enhancements?")
             response = self.take_command()
-            if response and ("yes" in response.lower() or "sure" in response.lower()):
-                self.advanced_config["voice_enhancements"]["enabled"] = True
+            if _affirmed(response):
+                self.set_config("voice_enhancements", "enabled", True)
 
                 # Configure wake word
                 self.speak("Would you like to use Hey Clover as your wake word?")
                 wake_word_response = self.take_command()
-                if wake_word_response and ("yes" in wake_word_response.lower() or "sure" in wake_word_response.lower()):
-                    self.advanced_config["voice_enhancements"]["wake_word"]["enabled"] = True
-                    self.advanced_config["voice_enhancements"]["wake_word"]["keywords"] = ["hey clover"]
+                if _affirmed(wake_word_response):
+                    self.set_config("voice_enhancements", "wake_word.enabled", True)
+                    self.set_config("voice_enhancements", "wake_word.keywords", ["hey clover"])
 
                     self.speak("Please enter your Picovoice access key in the console")
                     access_key = input("Picovoice access key: ")
                     if access_key:
-                        self.advanced_config["voice_enhancements"]["wake_word"]["access_key"] = access_key
+                        self.set_config("voice_enhancements", "wake_word.access_key", access_key)
                 else:
-                    self.advanced_config["voice_enhancements"]["wake_word"]["enabled"] = False
+                    self.set_config("voice_enhancements", "wake_word.enabled", False)
 
                 # Configure TTS
                 self.speak("Would you like to use a more natural-sounding voice?")
                 tts_response = self.take_command()
-                if tts_response and ("yes" in tts_response.lower() or "sure" in tts_response.lower()):
+                if _affirmed(tts_response):
                     self.speak("Which TTS engine would you prefer? Options are: best quality, Google, Microsoft Edge, or basic.")
                     engine_response = self.take_command()
 
                     if engine_response:
                         if "best" in engine_response.lower() or "quality" in engine_response.lower():
-                            self.advanced_config["voice_enhancements"]["tts"]["engine"] = "best"
+                            self.set_config("voice_enhancements", "tts.engine", "best")
 
                             self.speak("For the best quality voice, please enter your ElevenLabs API key in the console")
                             api_key = input("ElevenLabs API key: ")
                             if api_key:
-                                self.advanced_config["voice_enhancements"]["tts"]["api_key"] = api_key
+                                self.set_config("voice_enhancements", "tts.api_key", api_key)
 
                         elif "google" in engine_response.lower():
-                            self.advanced_config["voice_enhancements"]["tts"]["engine"] = "gtts"
+                            self.set_config("voice_enhancements", "tts.engine", "gtts")
 
                         elif "microsoft" in engine_response.lower() or "edge" in engine_response.lower():
-                            self.advanced_config["voice_enhancements"]["tts"]["engine"] = "edge"
+                            self.set_config("voice_enhancements", "tts.engine", "edge")
 
                         else:
-                            self.advanced_config["voice_enhancements"]["tts"]["engine"] = "pyttsx3"
+                            self.set_config("voice_enhancements", "tts.engine", "pyttsx3")
 
                     self.speak(f"Voice set to {self.advanced_config['voice_enhancements']['tts']['engine']}")
                 else:
-                    self.advanced_config["voice_enhancements"]["tts"]["engine"] = "pyttsx3"
+                    self.set_config("voice_enhancements", "tts.engine", "pyttsx3")
             else:
-                self.advanced_config["voice_enhancements"]["enabled"] = False
+                self.set_config("voice_enhancements", "enabled", False)
 
         # Save the configuration
         self.save_advanced_config()
@@ -592,7 +774,7 @@ def main():
             print("It looks like some advanced features are not configured.")
             assistant.speak("Would you like to configure the advanced features now?")
             response = assistant.take_command()
-            if response and ("yes" in response.lower() or "sure" in response.lower()):
+            if _affirmed(response):
                 assistant.configure_advanced()
 
         # Run with GUI if available and enabled
@@ -7,32 +7,36 @@ This module provides more natural-sounding voice synthesis using various TTS eng
 import os
 import io
 import time
-import tempfile
+import json
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import re
 import logging
 import threading
+import concurrent.futures
 import pygame
 import pyttsx3
+from collections import OrderedDict
 from typing import Optional, Dict, List, Any, Union
 from enum import Enum
 
-# Try to import optional TTS engines
-try:
-    import gtts
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
-
-try:
-    import edge_tts
-    EDGE_TTS_AVAILABLE = True
-except ImportError:
-    EDGE_TTS_AVAILABLE = False
-
-try:
-    import elevenlabs
-    ELEVENLABS_AVAILABLE = True
-except ImportError:
-    ELEVENLABS_AVAILABLE = False
+# Check which optional TTS engines are installed. They pull in heavy
+# dependencies, so each one is only imported once it is actually used.
+GTTS_AVAILABLE = importlib.util.find_spec("gtts") is not None
+EDGE_TTS_AVAILABLE = importlib.util.find_spec("edge_tts") is not None
+ELEVENLABS_AVAILABLE = importlib.util.find_spec("elevenlabs") is not None
+
+# TTS engine modules imported so far, by name
+_MODS = {}
+
+def _lazy_import(name: str):
+    """Import a TTS engine module on first use"""
+    module = _MODS.get(name)
+    if module is None:
+        module = _MODS[name] = importlib.import_module(name)
+    return module
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +45,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Speech from the online engines is cached here, one MP3 per utterance
+TTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hey-clover", "tts")
+# Size the cache is pruned back to at startup, least recently used first
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# The Edge TTS voice list is fetched online, so it is kept for a day
+EDGE_VOICES_FILE = os.path.join(os.path.dirname(TTS_CACHE_DIR), "edge_voices.json")
+EDGE_VOICES_TTL = 24 * 60 * 60
+
+# Sentence boundaries used to cache long replies piece by piece
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Phrases the assistant says often, synthesized into the cache at startup
+PRECACHE_PHRASES = [
+    "I'm listening",
+    "I'm not sure how to help with that",
+    "Sorry, I encountered an error while processing your request",
+    "What would you like me to note down?",
+    "I've made a note of that",
+    "Which city would you like to know the weather for?",
+]
+
+# Default size of the in-memory cache of recently spoken audio
+MEMORY_CACHE_BYTES = 10 * 1024 * 1024
+
+# Shared pyttsx3 engine. Starting SAPI5/espeak is slow, so it is created once
+# and reused by every speaker and fallback; each speaker applies its own rate,
+# volume and voice before speaking (see _say_pyttsx3).
+_PYTTSX3_ENGINE = None
+_PYTTSX3_DEFAULT_VOICE = None  # The engine's voice before any speaker changed it
+_PYTTSX3_LOCK = threading.Lock()
+_PYTTSX3_SAY_LOCK = threading.Lock()  # Held while a speaker sets properties and speaks
+
+def _get_pyttsx3():
+    """Get the shared pyttsx3 engine, creating it on first use"""
+    global _PYTTSX3_ENGINE, _PYTTSX3_DEFAULT_VOICE
+    with _PYTTSX3_LOCK:
+        if _PYTTSX3_ENGINE is None:
+            _PYTTSX3_ENGINE = pyttsx3.init()
+            _PYTTSX3_DEFAULT_VOICE = _PYTTSX3_ENGINE.getProperty('voice')
+    return _PYTTSX3_ENGINE
+
+# Speech is mono, and the small buffer starts playback sooner. The sample
+# rate is chosen per engine (MIXER_FREQUENCY).
+MIXER_SETTINGS = dict(size=-16, channels=1, buffer=1024)
+_MIXER_LOCK = threading.Lock()
+
+def _init_mixer(frequency: int) -> None:
+    """
+    Open the pygame mixer unless another speaker already did.
+
+    The mixer is shared by the whole process, so the first speaker's sample
+    rate wins; audio from an engine with a different rate is resampled.
+    """
+    with _MIXER_LOCK:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=frequency, **MIXER_SETTINGS)
+
 class TTSEngine(Enum):
     """Enum for available TTS engines"""
     PYTTSX3 = "pyttsx3"  # Default, offline
@@ -49,6 +111,50 @@ class TTSEngine(Enum):
     ELEVENLABS = "elevenlabs"  # ElevenLabs, online, high quality
     HINDI = "hindi"      # Hindi voice (using Google TTS)
 
+# How many sentences each online engine may synthesize at once
+# (the ElevenLabs free tier allows two concurrent requests)
+# Sample rate of each engine's MP3 output, used to open the mixer without
+# resampling. gTTS (also used for Hindi) and Edge TTS produce 24 kHz;
+# ElevenLabs defaults to 44.1 kHz.
+MIXER_FREQUENCY = {
+    TTSEngine.ELEVENLABS: 44100,
+}
+DEFAULT_MIXER_FREQUENCY = 24000
+
+SYNTH_CONCURRENCY = {
+    TTSEngine.ELEVENLABS: 2,
+    TTSEngine.EDGE_TTS: 4,
+    TTSEngine.GTTS: 4,
+    TTSEngine.HINDI: 4,
+}
+
+def prune_tts_cache(max_bytes: int = TTS_CACHE_MAX_BYTES) -> None:
+    """Delete the least recently used cached speech until the cache fits in max_bytes"""
+    files = []
+    try:
+        with os.scandir(TTS_CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    if removed:
+        logger.info(f"Pruned {removed} files from the speech cache")
+
+
 class AdvancedTTS:
     """
     Advanced Text-to-Speech with multiple engine options
@@ -60,7 +166,10 @@ class AdvancedTTS:
                  rate: int = 150,
                  volume: float = 1.0,
                  pitch: float = 1.0,
-                 language: str = 'en'):
+                 language: str = 'en',
+                 memory_cache_bytes: int = MEMORY_CACHE_BYTES,
+                 sentence_cache: bool = True,
+                 precache_phrases: Optional[List[str]] = None):
         """
         Initialize the advanced TTS engine.
 
@@ -71,6 +180,11 @@ class AdvancedTTS:
             rate: Speech rate (words per minute)
             volume: Volume level (0.0 to 1.0)
             pitch: Voice pitch (0.5 to 2.0)
+            language: Language code for the online engines
+            memory_cache_bytes: How much recently spoken audio to keep in memory
+            sentence_cache: Synthesize and cache each sentence separately
+            precache_phrases: Phrases to synthesize in the background at startup
+                (defaults to PRECACHE_PHRASES)
         """
         # Convert string to enum if needed
         if isinstance(engine, str):
@@ -89,87 +203,143 @@ class AdvancedTTS:
         self.pitch = pitch
         self.language = language
 
-        # Initialize pygame for audio playback
-        pygame.mixer.init()
+        # Most recently used audio last, keyed by cache path
+        self._mem_cache = OrderedDict()
+        self._mem_bytes = 0
+        self._mem_cap = memory_cache_bytes
+        self._mem_lock = threading.Lock()
+
+        # Voices for the selected engine, filled in on first request
+        self._voices_cache: Optional[List[Dict[str, Any]]] = None
+        self.sentence_cache = sentence_cache
+
+        # Event loop for the async Edge TTS API, run on a background thread
+        # and started on first use
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+        # Workers that synthesize upcoming sentences while the current one
+        # plays, and the audio they are still fetching, keyed by cache path
+        # (both guarded by _pool_lock)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._prefetching: Dict[str, concurrent.futures.Future] = {}
 
         # Initialize the selected engine
         self._initialize_engine()
 
+        # Initialize pygame for audio playback, at the engine's sample rate
+        _init_mixer(MIXER_FREQUENCY.get(self.engine_type, DEFAULT_MIXER_FREQUENCY))
+
+        # Fill the cache with common phrases so the first replies are hits,
+        # then keep its size in check. pyttsx3 speaks locally and has nothing
+        # to cache.
+        self.precache_phrases = PRECACHE_PHRASES if precache_phrases is None else precache_phrases
+        if self.engine_type != TTSEngine.PYTTSX3:
+            threading.Thread(target=self._maintain_cache, daemon=True).start()
+
     def _initialize_engine(self) -> None:
-        """Initialize the selected TTS engine"""
-        try:
-            if self.engine_type == TTSEngine.PYTTSX3:
-                self.engine = pyttsx3.init()
+        """Initialize the selected TTS engine, falling back to pyttsx3"""
+        init = {
+            TTSEngine.PYTTSX3: self._init_pyttsx3,
+            TTSEngine.GTTS: self._init_gtts,
+            TTSEngine.EDGE_TTS: self._init_edge_tts,
+            TTSEngine.ELEVENLABS: self._init_elevenlabs,
+            TTSEngine.HINDI: self._init_hindi,
+        }
+
+        candidates = [self.engine_type]
+        if self.engine_type != TTSEngine.PYTTSX3:
+            candidates.append(TTSEngine.PYTTSX3)
+
+        for engine_type in candidates:
+            self.engine_type = engine_type
+            try:
+                if init[engine_type]():
+                    return
+            except Exception as e:
+                logger.error(f"Error initializing TTS engine: {e}")
 
-                # Set properties
-                self.engine.setProperty('rate', self.rate)
-                self.engine.setProperty('volume', self.volume)
+            if engine_type != TTSEngine.PYTTSX3:
+                logger.warning("Falling back to pyttsx3.")
 
-                # Set voice if specified
-                if self.voice_id:
-                    self.engine.setProperty('voice', self.voice_id)
-                # Otherwise use the first available voice
-                else:
-                    voices = self.engine.getProperty('voices')
-                    if voices:
-                        self.engine.setProperty('voice', voices[0].id)
-                        self.voice_id = voices[0].id
+    def _init_pyttsx3(self) -> bool:
+        """Initialize the offline pyttsx3 engine"""
+        self.engine = _get_pyttsx3()
 
-                logger.info(f"Initialized pyttsx3 TTS engine with voice: {self.voice_id}")
+        # Set properties
+        self.engine.setProperty('rate', self.rate)
+        self.engine.setProperty('volume', self.volume)
 
-            elif self.engine_type == TTSEngine.GTTS and GTTS_AVAILABLE:
-                # Google TTS doesn't need initialization, just check if it's available
-                logger.info("Initialized Google TTS engine")
+        # Set voice if specified
+        if self.voice_id:
+            self.engine.setProperty('voice', self.voice_id)
+        # Otherwise use the first available voice
+        else:
+            voices = self.engine.getProperty('voices')
+            if voices:
+                self.engine.setProperty('voice', voices[0].id)
+                self.voice_id = voices[0].id
+
+        logger.info(f"Initialized pyttsx3 TTS engine with voice: {self.voice_id}")
+        return True
+
+    def _init_gtts(self) -> bool:
+        """Initialize Google TTS"""
+        if not GTTS_AVAILABLE:
+            logger.warning("Google TTS is not available.")
+            return False
 
-            elif self.engine_type == TTSEngine.EDGE_TTS and EDGE_TTS_AVAILABLE:
-                # Edge TTS doesn't need initialization, just check if it's available
-                logger.info("Initialized Microsoft Edge TTS engine")
+        # Google TTS doesn't need initialization, just check if it's available
+        logger.info("Initialized Google TTS engine")
+        return True
 
-                # Set default voice if not specified
-                if not self.voice_id:
-                    self.voice_id = "en-US-AriaNeural"
+    def _init_edge_tts(self) -> bool:
+        """Initialize Microsoft Edge TTS"""
+        if not EDGE_TTS_AVAILABLE:
+            logger.warning("Edge TTS is not available.")
+            return False
 
-            elif self.engine_type == TTSEngine.ELEVENLABS and ELEVENLABS_AVAILABLE:
-                # Set API key for ElevenLabs
-                if self.api_key:
-                    elevenlabs.set_api_key(self.api_key)
-
-                    # Set default voice if not specified
-                    if not self.voice_id:
-                        # Use the first available voice
-                        voices = elevenlabs.voices()
-                        if voices:
-                            self.voice_id = voices[0].voice_id
-
-                    logger.info(f"Initialized ElevenLabs TTS engine with voice: {self.voice_id}")
-                else:
-                    logger.warning("ElevenLabs API key not provided. Falling back to pyttsx3.")
-                    self.engine_type = TTSEngine.PYTTSX3
-                    self._initialize_engine()
-
-            elif self.engine_type == TTSEngine.HINDI:
-                # For Hindi voice, we'll use Google TTS with Hindi language
-                if GTTS_AVAILABLE:
-                    logger.info("Initialized Hindi voice using Google TTS")
-                    # No specific initialization needed for gTTS
-                else:
-                    logger.warning("Google TTS not available for Hindi voice. Falling back to pyttsx3.")
-                    self.engine_type = TTSEngine.PYTTSX3
-                    self._initialize_engine()
+        # Edge TTS doesn't need initialization, just check if it's available
+        logger.info("Initialized Microsoft Edge TTS engine")
 
-            else:
-                # Fallback to pyttsx3 if the selected engine is not available
-                logger.warning(f"{self.engine_type.value} is not available. Falling back to pyttsx3.")
-                self.engine_type = TTSEngine.PYTTSX3
-                self._initialize_engine()
+        # Set default voice if not specified
+        if not self.voice_id:
+            self.voice_id = "en-US-AriaNeural"
+        return True
 
-        except Exception as e:
-            logger.error(f"Error initializing TTS engine: {e}")
-            # Fallback to pyttsx3 if there's an error
-            if self.engine_type != TTSEngine.PYTTSX3:
-                logger.warning("Falling back to pyttsx3.")
-                self.engine_type = TTSEngine.PYTTSX3
-                self._initialize_engine()
+    def _init_elevenlabs(self) -> bool:
+        """Initialize ElevenLabs"""
+        if not ELEVENLABS_AVAILABLE:
+            logger.warning("ElevenLabs is not available.")
+            return False
+
+        if not self.api_key:
+            logger.warning("ElevenLabs API key not provided.")
+            return False
+
+        # Set API key for ElevenLabs
+        _lazy_import("elevenlabs").set_api_key(self.api_key)
+
+        # Set default voice if not specified
+        if not self.voice_id:
+            # Use the first available voice
+            voices = _lazy_import("elevenlabs").voices()
+            if voices:
+                self.voice_id = voices[0].voice_id
+
+        logger.info(f"Initialized ElevenLabs TTS engine with voice: {self.voice_id}")
+        return True
+
+    def _init_hindi(self) -> bool:
+        """Initialize the Hindi voice, which uses Google TTS"""
+        if not GTTS_AVAILABLE:
+            logger.warning("Google TTS not available for Hindi voice.")
+            return False
+
+        # No specific initialization needed for gTTS
+        logger.info("Initialized Hindi voice using Google TTS")
+        return True
 
     def speak(self, text: str) -> bool:
         """
@@ -181,158 +351,313 @@ class AdvancedTTS:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not text:
+        if not text or not text.strip():
             return False
 
-        try:
-            if self.engine_type == TTSEngine.PYTTSX3:
-                # Use pyttsx3
-                self.engine.say(text)
-                self.engine.runAndWait()
-                return True
-
-            elif self.engine_type == TTSEngine.GTTS and GTTS_AVAILABLE:
-                # Use Google TTS
-                tts = gtts.gTTS(text=text, lang=self.language, slow=False)
-
-                # Save to a temporary file and play
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                    temp_file = fp.name
-
-                tts.save(temp_file)
-                self._play_audio(temp_file)
-
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
-
+        if self.engine_type == TTSEngine.PYTTSX3:
+            try:
+                self._say_pyttsx3(text)
                 return True
+            except Exception as e:
+                logger.error(f"Error in speech synthesis: {e}")
+                return False
 
-            elif self.engine_type == TTSEngine.EDGE_TTS and EDGE_TTS_AVAILABLE:
-                # Use Microsoft Edge TTS
-                communicate = edge_tts.Communicate(text, self.voice_id)
-
-                # Save to a temporary file and play
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                    temp_file = fp.name
-
-                # Run the async function in a synchronous context
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(communicate.save(temp_file))
-                finally:
-                    loop.close()
-
-                self._play_audio(temp_file)
+        # Sentences repeat far more often than whole replies, so each one
+        # is cached and played on its own
+        segments = self._split_sentences(text) if self.sentence_cache else [text]
+        played = 0
+        try:
+            # Fetch the later sentences in the background and play each one as
+            # soon as it and the ones before it are ready
+            self._prefetch(segments[1:])
+            for segment in segments:
+                self._play_audio(self._get_audio(segment))
+                played += 1
+            return True
 
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+        except Exception as e:
+            logger.error(f"Error in speech synthesis: {e}")
 
+            # Fall back to pyttsx3 for the sentences that were not played yet
+            logger.warning("Falling back to pyttsx3 for this speech.")
+            try:
+                self._say_pyttsx3(" ".join(segments[played:]))
                 return True
+            except Exception as e2:
+                logger.error(f"Fallback speech synthesis also failed: {e2}")
+            return False
 
-            elif self.engine_type == TTSEngine.ELEVENLABS and ELEVENLABS_AVAILABLE:
-                # Use ElevenLabs
-                audio = elevenlabs.generate(
-                    text=text,
-                    voice=self.voice_id,
-                    model="eleven_monolingual_v1"
-                )
+    def _say_pyttsx3(self, text: str) -> None:
+        """Speak text with the shared pyttsx3 engine, in this speaker's rate, volume and voice"""
+        engine = _get_pyttsx3()
+        # Only a pyttsx3 speaker's voice_id names a pyttsx3 voice; fallback
+        # speech from the other engines uses the system default voice
+        voice = self.voice_id if self.engine_type == TTSEngine.PYTTSX3 else _PYTTSX3_DEFAULT_VOICE
+        with _PYTTSX3_SAY_LOCK:
+            # Another speaker may have changed these since this one last spoke
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+            if voice:
+                engine.setProperty('voice', voice)
+            engine.say(text)
+            engine.runAndWait()
+
+    def _split_sentences(self, text: str) -> List[str]:
+        """Split text into sentences, dropping empty pieces"""
+        return [sentence for sentence in SENTENCE_END.split(text.strip()) if sentence]
+
+    def _get_audio(self, text: str) -> bytes:
+        """
+        Get the MP3 audio for text, synthesizing it only if it is not cached.
 
-                # Save to a temporary file and play
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                    temp_file = fp.name
-                    fp.write(audio)
+        The online engines synthesize MP3 data in memory. It is cached in
+        memory and, off the playback path, on disk so repeated phrases skip
+        the request.
 
-                self._play_audio(temp_file)
+        Args:
+            text: Text to convert to speech
 
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+        Returns:
+            bytes: MP3 data
+        """
+        cache_path = self._cache_path(text)
+        with self._pool_lock:
+            pending = self._prefetching.get(cache_path)
+        if pending is not None:
+            # Already being fetched in the background
+            return pending.result()
+        return self._load_audio(text, cache_path)
+
+    def _load_audio(self, text: str, cache_path: str) -> bytes:
+        """Get the audio for text from the caches, or synthesize it"""
+        audio = self._cache_get(cache_path)
+        if audio is None:
+            if os.path.exists(cache_path):
+                with open(cache_path, "rb") as f:
+                    audio = f.read()
+                self._touch(cache_path)
+            else:
+                audio = self._synthesize(text)
+                # Start playing straight from memory; the disk copy can wait
+                threading.Thread(target=self._store_audio, args=(cache_path, audio), daemon=True).start()
+            self._cache_put(cache_path, audio)
+        return audio
+
+    def _prefetch(self, segments: List[str]) -> None:
+        """Start synthesizing segments in the background, so _get_audio only waits for them"""
+        for segment in segments:
+            cache_path = self._cache_path(segment)
+            if self._cache_get(cache_path) is not None:
+                continue
+            with self._pool_lock:
+                if cache_path in self._prefetching:
+                    continue
+                if self._pool is None:
+                    workers = SYNTH_CONCURRENCY.get(self.engine_type, 1)
+                    self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+                future = self._pool.submit(self._load_audio, segment, cache_path)
+                self._prefetching[cache_path] = future
+            # Added outside the lock, since it runs at once if the future is already done
+            future.add_done_callback(lambda _, path=cache_path: self._forget_prefetch(path))
+
+    def _forget_prefetch(self, cache_path: str) -> None:
+        """Drop a finished prefetch; its audio is in the memory cache by now"""
+        with self._pool_lock:
+            self._prefetching.pop(cache_path, None)
+
+    def _cache_path(self, text: str) -> str:
+        """
+        Get the cache file for text spoken with the current engine settings.
 
-                return True
+        Args:
+            text: Text to be spoken
 
-            elif self.engine_type == TTSEngine.HINDI and GTTS_AVAILABLE:
-                # Use Google TTS with Hindi language
+        Returns:
+            str: Path of the cached MP3 file (it may not exist yet)
+        """
+        key = f"{self.engine_type.value}|{self.voice_id}|{self.language}|{self.rate}|{self.pitch}|{text}"
+        return os.path.join(TTS_CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".mp3")
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        """Get audio from the in-memory cache, marking it as recently used"""
+        with self._mem_lock:
+            audio = self._mem_cache.get(key)
+            if audio is not None:
+                self._mem_cache.move_to_end(key)
+            return audio
+
+    def _cache_put(self, key: str, audio: bytes) -> None:
+        """Add audio to the in-memory cache, evicting the least recently used"""
+        if len(audio) > self._mem_cap:
+            return
+        with self._mem_lock:
+            if key in self._mem_cache:
+                return
+            self._mem_cache[key] = audio
+            self._mem_bytes += len(audio)
+            while self._mem_bytes > self._mem_cap:
+                _, evicted = self._mem_cache.popitem(last=False)
+                self._mem_bytes -= len(evicted)
+
+    def _touch(self, cache_path: str) -> None:
+        """Mark a cached file as recently used, so pruning keeps it"""
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    def _maintain_cache(self) -> None:
+        """Warm the cache, then prune it"""
+        self._warm_cache()
+        prune_tts_cache()
+
+    def _warm_cache(self) -> None:
+        """Synthesize the precache phrases that are not cached yet"""
+        for phrase in self.precache_phrases:
+            for segment in (self._split_sentences(phrase) if self.sentence_cache else [phrase]):
+                cache_path = self._cache_path(segment)
+                if os.path.exists(cache_path):
+                    self._touch(cache_path)
+                    continue
                 try:
-                    # Create a gTTS object with Hindi language
-                    tts = gtts.gTTS(text=text, lang='hi', slow=False)
-
-                    # Save to a temporary file
-                    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as fp:
-                        tts.save(fp.name)
-                        temp_file = fp.name
-
-                    # Play the audio
-                    self._play_audio(temp_file)
-
-                    # Clean up the temporary file
-                    try:
-                        os.unlink(temp_file)
-                    except:
-                        pass
-
-                    return True
+                    self._store_audio(cache_path, self._synthesize(segment))
                 except Exception as e:
-                    logger.error(f"Error using Hindi voice: {e}")
-                    # Fallback to pyttsx3
-                    engine = pyttsx3.init()
-                    engine.say(text)
-                    engine.runAndWait()
-                    return True
+                    logger.warning(f"Could not precache speech: {e}")
+                    return
+
+    def _run_async(self, coro):
+        """Run a coroutine on the background event loop and wait for its result"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        """Stop the background event loop and prefetch workers, if they were started"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    async def _edge_stream(self, text: str) -> bytes:
+        """Collect the audio chunks Edge TTS streams back for text"""
+        buffer = io.BytesIO()
+        async for chunk in _lazy_import("edge_tts").Communicate(text, self.voice_id).stream():
+            if chunk["type"] == "audio":
+                buffer.write(chunk["data"])
+        return buffer.getvalue()
+
+    def _synthesize(self, text: str) -> bytes:
+        """
+        Synthesize text with the selected online engine.
 
-            else:
-                logger.error(f"Unknown TTS engine: {self.engine_type}")
-                return False
+        Args:
+            text: Text to convert to speech
 
-        except Exception as e:
-            logger.error(f"Error in speech synthesis: {e}")
+        Returns:
+            bytes: MP3 data
+        """
+        if self.engine_type == TTSEngine.GTTS and GTTS_AVAILABLE:
+            # Use Google TTS
+            buffer = io.BytesIO()
+            _lazy_import("gtts").gTTS(text=text, lang=self.language, slow=False).write_to_fp(buffer)
+            audio = buffer.getvalue()
+
+        elif self.engine_type == TTSEngine.EDGE_TTS and EDGE_TTS_AVAILABLE:
+            # Use Microsoft Edge TTS, streaming the audio into memory
+            audio = self._run_async(self._edge_stream(text))
+
+        elif self.engine_type == TTSEngine.ELEVENLABS and ELEVENLABS_AVAILABLE:
+            # Use ElevenLabs
+            audio = _lazy_import("elevenlabs").generate(
+                text=text,
+                voice=self.voice_id,
+                model="eleven_monolingual_v1"
+            )
+
+        elif self.engine_type == TTSEngine.HINDI and GTTS_AVAILABLE:
+            # Use Google TTS with Hindi language. Hindi is always supported,
+            # so skip validating the language on every request.
+            buffer = io.BytesIO()
+            _lazy_import("gtts").gTTS(text=text, lang='hi', slow=False, lang_check=False).write_to_fp(buffer)
+            audio = buffer.getvalue()
 
-            # Try fallback to pyttsx3 if another engine fails
-            if self.engine_type != TTSEngine.PYTTSX3:
-                logger.warning("Falling back to pyttsx3 for this speech.")
-                try:
-                    engine = pyttsx3.init()
-                    engine.say(text)
-                    engine.runAndWait()
-                    return True
-                except Exception as e2:
-                    logger.error(f"Fallback speech synthesis also failed: {e2}")
+        else:
+            raise ValueError(f"Unknown TTS engine: {self.engine_type}")
 
-            return False
+        return audio
+
+    def _store_audio(self, path: str, audio: bytes) -> None:
+        """
+        Write synthesized audio to the disk cache.
 
-    def _play_audio(self, file_path: str) -> None:
+        Args:
+            path: Cache file to write
+            audio: MP3 data
+        """
+        # Write to a side file first so a failed write never leaves a
+        # partial file that later looks like a cache hit
+        part_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(part_path, "wb") as f:
+                f.write(audio)
+            os.replace(part_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache speech: {e}")
+
+    def _play_audio(self, audio: Union[str, bytes]) -> None:
         """
-        Play an audio file using pygame.
+        Play audio using pygame.
 
         Args:
-            file_path: Path to the audio file
+            audio: Path to an audio file, or the MP3 data itself
         """
         try:
-            pygame.mixer.music.load(file_path)
+            if isinstance(audio, bytes):
+                pygame.mixer.music.load(io.BytesIO(audio), "mp3")
+            else:
+                pygame.mixer.music.load(audio)
             pygame.mixer.music.play()
 
-            # Wait for the audio to finish playing
+            # Wait for the audio to finish playing. End-of-track events need the
+            # pygame display, which the background assistant never opens, so
+            # sleep between checks instead.
             while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
+                pygame.time.wait(100)
 
         except Exception as e:
             logger.error(f"Error playing audio: {e}")
 
-    def get_available_voices(self) -> List[Dict[str, Any]]:
+    def get_available_voices(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get a list of available voices for the current engine.
 
+        Voices are only looked up when first asked for and are cached after
+        that; the Edge TTS list is also saved to disk for a day.
+
+        Args:
+            refresh: Fetch the list again instead of using the caches
+
         Returns:
             list: List of available voices
         """
+        # The installed voices do not change while the assistant runs
+        if self._voices_cache is not None and not refresh:
+            return self._voices_cache
+
         voices = []
 
         try:
@@ -348,12 +673,11 @@ class AdvancedTTS:
                     })
 
             elif self.engine_type == TTSEngine.EDGE_TTS and EDGE_TTS_AVAILABLE:
-                # Get Edge TTS voices
-                # This requires running an async function
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    voice_list = loop.run_until_complete(edge_tts.list_voices())
+                # Get Edge TTS voices, from the file cache when it is recent
+                voices = [] if refresh else self._load_edge_voices()
+                if not voices:
+                    # This requires running an async function
+                    voice_list = self._run_async(_lazy_import("edge_tts").list_voices())
                     for voice in voice_list:
                         voices.append({
                             'id': voice["ShortName"],
@@ -362,12 +686,11 @@ class AdvancedTTS:
                             'gender': voice["Gender"],
                             'engine': 'edge'
                         })
-                finally:
-                    loop.close()
+                    self._save_edge_voices(voices)
 
             elif self.engine_type == TTSEngine.ELEVENLABS and ELEVENLABS_AVAILABLE:
                 # Get ElevenLabs voices
-                voice_list = elevenlabs.voices()
+                voice_list = _lazy_import("elevenlabs").voices()
                 for voice in voice_list:
                     voices.append({
                         'id': voice.voice_id,
@@ -378,9 +701,32 @@ class AdvancedTTS:
 
         except Exception as e:
             logger.error(f"Error getting available voices: {e}")
+            return voices
 
+        self._voices_cache = voices
         return voices
 
+    def _load_edge_voices(self) -> List[Dict[str, Any]]:
+        """Load the saved Edge TTS voice list, or return [] if it is missing or stale"""
+        try:
+            if time.time() - os.path.getmtime(EDGE_VOICES_FILE) < EDGE_VOICES_TTL:
+                with open(EDGE_VOICES_FILE, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return []
+
+    def _save_edge_voices(self, voices: List[Dict[str, Any]]) -> None:
+        """Save the Edge TTS voice list for other runs"""
+        if not voices:
+            return
+        try:
+            os.makedirs(os.path.dirname(EDGE_VOICES_FILE), exist_ok=True)
+            with open(EDGE_VOICES_FILE, "w", encoding="utf-8") as f:
+                json.dump(voices, f)
+        except OSError as e:
+            logger.warning(f"Could not save Edge TTS voices: {e}")
+
     def set_voice(self, voice_id: str) -> bool:
         """
         Set the voice to use for speech synthesis.
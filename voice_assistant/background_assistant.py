@@ -40,6 +40,9 @@ class BackgroundAssistant:
         self.tray_icon = None
         self.resource_monitor_thread = None
 
+        # Set to wake the resource monitor and make it exit
+        self._stop_event = threading.Event()
+
         # Resource usage limits
         self.max_cpu_percent = 30.0  # Maximum CPU usage percentage (increased from 15%)
         self.max_memory_mb = 300.0   # Maximum memory usage in MB (increased from 200MB)
@@ -112,6 +115,7 @@ class BackgroundAssistant:
             self.assistant_thread = threading.Thread(target=self._assistant_thread_func)
             self.assistant_thread.daemon = True
             self.is_running = True
+            self._stop_event.clear()
             self.assistant_thread.start()
 
             # Start resource monitoring
@@ -135,6 +139,7 @@ class BackgroundAssistant:
             logger.error(f"Error in assistant thread: {e}")
         finally:
             self.is_running = False
+            self._stop_event.set()
 
             # Update tray icon tooltip
             if self.tray_icon:
@@ -178,23 +183,35 @@ class BackgroundAssistant:
 
     def stop_resource_monitoring(self) -> None:
         """Stop monitoring resource usage"""
-        # The thread will stop automatically when the assistant stops
+        # Wake the monitor so it exits now instead of after its next check
+        self._stop_event.set()
+        if self.resource_monitor_thread and self.resource_monitor_thread.is_alive():
+            self.resource_monitor_thread.join(timeout=2.0)
+
         logger.info("Resource monitoring stopped")
 
     def _resource_monitor_thread_func(self) -> None:
         """Thread function for monitoring resource usage"""
         process = psutil.Process(os.getpid())
 
-        while self.is_running:
+        # Prime the CPU counter so later calls measure since the previous one
+        # without blocking
+        process.cpu_percent(None)
+        next_log = time.monotonic() + 60.0
+
+        # Check every 5 seconds until the assistant stops
+        while not self._stop_event.wait(5.0):
             try:
                 # Get CPU and memory usage
-                cpu_percent = process.cpu_percent(interval=1.0)
+                cpu_percent = process.cpu_percent(None)
                 memory_info = process.memory_info()
                 memory_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
 
                 # Log resource usage every 60 seconds
-                if int(time.time()) % 60 == 0:
+                now = time.monotonic()
+                if now >= next_log:
                     logger.info(f"Resource usage: CPU: {cpu_percent:.1f}%, Memory: {memory_mb:.1f} MB")
+                    next_log = now + 60.0
 
                 # Check if resource usage exceeds limits
                 if cpu_percent > self.max_cpu_percent:
@@ -204,12 +221,9 @@ class BackgroundAssistant:
                 if memory_mb > self.max_memory_mb:
                     logger.warning(f"Memory usage too high: {memory_mb:.1f} MB (limit: {self.max_memory_mb:.1f} MB)")
                     # Implement memory optimization here if needed
-
-                # Sleep for a short time
-                time.sleep(5.0)
             except Exception as e:
                 logger.error(f"Error monitoring resources: {e}")
-                time.sleep(10.0)
+                self._stop_event.wait(5.0)
 
     def exit_application(self) -> None:
         """Exit the application"""
@@ -1,32 +1,40 @@
 import pyttsx3
 
-# Initialize the TTS engine
-engine = pyttsx3.init()
+def is_hindi(voice):
+    """Check whether a voice speaks Hindi"""
+    return "hindi" in voice.name.lower() or "hi-in" in voice.id.lower()
 
-# Get all available voices
-voices = engine.getProperty('voices')
+def main():
+    # Initialize the TTS engine
+    engine = pyttsx3.init()
 
-# Print all voices with their details
-print("Available voices:")
-print("-" * 50)
-for i, voice in enumerate(voices):
-    print(f"Voice #{i+1}:")
-    print(f"  ID: {voice.id}")
-    print(f"  Name: {voice.name}")
-    print(f"  Languages: {voice.languages}")
-    print(f"  Gender: {voice.gender}")
-    print(f"  Age: {voice.age}")
-    print("-" * 50)
+    # Get all available voices
+    voices = engine.getProperty('voices')
 
-# Check specifically for Hindi voices
-hindi_voices = [voice for voice in voices if "hindi" in voice.name.lower() or "hi-in" in voice.id.lower()]
-if hindi_voices:
-    print("\nHindi voices found:")
-    for voice in hindi_voices:
+    # Print all voices with their details
+    print("Available voices:")
+    print("-" * 50)
+    for i, voice in enumerate(voices):
+        print(f"Voice #{i+1}:")
         print(f"  ID: {voice.id}")
         print(f"  Name: {voice.name}")
-else:
-    print("\nNo Hindi voices found in the system.")
+        print(f"  Languages: {voice.languages}")
+        print(f"  Gender: {voice.gender}")
+        print(f"  Age: {voice.age}")
+        print("-" * 50)
+
+    # Check specifically for Hindi voices
+    hindi_voices = [voice for voice in voices if is_hindi(voice)]
+    if hindi_voices:
+        print("\nHindi voices found:")
+        for voice in hindi_voices:
+            print(f"  ID: {voice.id}")
+            print(f"  Name: {voice.name}")
+    else:
+        print("\nNo Hindi voices found in the system.")
+
+    # Keep the window open
+    input("\nPress Enter to exit...")
 
-# Keep the window open
-input("\nPress Enter to exit...")
+if __name__ == "__main__":
+    main()
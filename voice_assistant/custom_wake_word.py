@@ -5,13 +5,17 @@ This module provides a custom wake word detection implementation that supports "
 """
 
 import os
+import sys
+import queue
 import struct
 import time
 import threading
 import pyaudio
 import pvporcupine
 import logging
-from typing import List, Optional, Callable
+import functools
+from collections import deque
+from typing import List, Optional, Tuple, Callable
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +24,102 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Audio frames captured but not yet checked; when detection falls behind the
+# oldest are dropped
+FRAME_QUEUE_SIZE = 8
+
+# Porcupine frames delivered per audio callback. A larger host buffer gives
+# PortAudio more slack when Python is slow to run the callback.
+FRAMES_PER_CALLBACK = 2
+
+# Minimum seconds between warnings about dropped frames
+DROP_REPORT_INTERVAL = 10.0
+
+# Frames whose loudest sample stays below this are treated as silence and not
+# checked for the wake word. A few frames before and after each louder stretch
+# are still checked so a wake word is never cut off at either end.
+SILENCE_THRESHOLD = 300
+PREROLL_FRAMES = 8  # About a quarter of a second at Porcupine's frame rate
+HANGOVER_FRAMES = 16  # About half a second
+
+# The threshold is raised above the background noise measured over the first
+# frames after starting, up to a level that would still let speech through
+CALIBRATION_FRAMES = 20
+MAX_SILENCE_THRESHOLD = 2000
+
+# Windows THREAD_PRIORITY_HIGHEST; TIME_CRITICAL could starve the audio driver
+_THREAD_PRIORITY_HIGHEST = 2
+
+def _raise_thread_priority() -> None:
+    """
+    Ask the OS to schedule the calling thread ahead of normal threads so
+    frames are checked on time on a busy machine. Needs no privileges on
+    Windows; elsewhere it only works when the process is allowed real-time
+    scheduling, and is skipped otherwise.
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), _THREAD_PRIORITY_HIGHEST)
+        elif hasattr(os, "sched_setscheduler"):
+            # On Linux, pid 0 means the calling thread
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+    except (OSError, AttributeError) as e:
+        logger.debug(f"Could not raise wake word thread priority: {e}")
+
+# Built-in keywords used for "Hey Clover", best first
+PREFERRED_KEYWORDS = ("jarvis", "computer", "alexa")
+
+@functools.lru_cache(maxsize=1)
+def _pick_wake_keyword() -> str:
+    """Choose the built-in keyword that stands in for "Hey Clover" (computed once)"""
+    # Use only available keywords
+    available_keywords = frozenset(pvporcupine.KEYWORDS)
+    logger.info(f"Available keywords: {sorted(available_keywords)}")
+
+    # Use the first preferred built-in keyword, or else any keyword
+    # that is not 'hey google' or 'ok google'
+    keyword = next((kw for kw in PREFERRED_KEYWORDS if kw in available_keywords), None)
+    if keyword is None:
+        others = sorted(available_keywords)
+        if not others:
+            # Let Porcupine report the missing keyword files
+            return PREFERRED_KEYWORDS[0]
+        keyword = next((kw for kw in others if "google" not in kw.lower()), others[0])
+    logger.info(f"Using '{keyword}' as the wake word (will respond to 'Hey Clover')")
+    return keyword
+
+# Porcupine instances released by stopped detectors, keyed by access key,
+# keywords and sensitivity. Loading the model is slow, so a detector that is
+# restarted with the same settings takes one from here instead. An instance
+# keeps per-stream state, so it is never used by two detectors at once.
+_idle_porcupines = {}
+_porcupine_lock = threading.Lock()
+
+def _acquire_porcupine(key):
+    """Get an idle Porcupine instance for key, or create one"""
+    access_key, keywords, sensitivity = key
+    with _porcupine_lock:
+        idle = _idle_porcupines.get(key)
+        if idle:
+            return idle.pop()
+
+    return pvporcupine.create(
+        access_key=access_key,
+        keywords=list(keywords),
+        sensitivities=[sensitivity] * len(keywords)
+    )
+
+def _release_porcupine(key, porcupine) -> None:
+    """Keep a Porcupine instance for reuse, or delete it if one is already kept"""
+    with _porcupine_lock:
+        idle = _idle_porcupines.setdefault(key, [])
+        if not idle:
+            idle.append(porcupine)
+            return
+    porcupine.delete()
+
 class CustomWakeWordDetector:
     """
     Custom wake word detector with support for "Hey Clover" and other keywords
@@ -43,11 +143,24 @@ class CustomWakeWordDetector:
         self.sensitivity = sensitivity
         self.callback = callback
         self.porcupine = None
+        self._porcupine_key = None
         self.pa = None
         self.audio_stream = None
         self.is_running = False
         self.thread = None
         self.processed_keywords = []  # Will store the actual keywords used
+        self.followers = ()  # Detectors fed from this detector's audio stream (replaced, never mutated)
+        self.leader = None  # Detector whose audio stream feeds this one
+        self._unpack_frame = None  # Decodes one frame of 16-bit samples
+        self._frame_bytes = 0  # Size of one frame of 16-bit samples
+        # Audio buffers from the callback, each holding FRAMES_PER_CALLBACK frames; None to stop
+        self._buffers = queue.Queue(maxsize=max(1, FRAME_QUEUE_SIZE // FRAMES_PER_CALLBACK))
+        self.dropped_frames = 0  # Frames discarded because detection fell behind
+        self.input_overflows = 0  # Callbacks where PortAudio lost input before handing it over
+        self._cleanup_lock = threading.RLock()  # stop() and the detection thread both clean up
+        self.silence_threshold = SILENCE_THRESHOLD  # 0 checks every frame
+        self._events = queue.SimpleQueue()  # Detected keyword indexes, None to stop
+        self._event_thread = None  # Reports detections, started on the first one
 
         # Map for custom keywords to built-in keywords
         # If "hey clover" is not available as a built-in keyword, we'll use a similar one
@@ -59,56 +172,38 @@ class CustomWakeWordDetector:
     def initialize(self) -> bool:
         """Initialize Porcupine and audio stream"""
         try:
-            # Use only available keywords
-            available_keywords = pvporcupine.KEYWORDS
-            logger.info(f"Available keywords: {available_keywords}")
-
-            # Explicitly use 'jarvis' as our wake word and avoid 'hey google'
-            # Make sure we're using a keyword that's definitely available
-            if "jarvis" in available_keywords:
-                processed_keywords = ["jarvis"]
-                logger.info(f"Using 'jarvis' as the wake word (will respond to 'Hey Clover')")
-            elif "computer" in available_keywords:
-                processed_keywords = ["computer"]
-                logger.info(f"Using 'computer' as the wake word (will respond to 'Hey Clover')")
-            elif "alexa" in available_keywords:
-                processed_keywords = ["alexa"]
-                logger.info(f"Using 'alexa' as the wake word (will respond to 'Hey Clover')")
-            else:
-                # Use the first available keyword that's not 'hey google' or 'ok google'
-                for kw in available_keywords:
-                    if "google" not in kw.lower():
-                        processed_keywords = [kw]
-                        logger.info(f"Using '{kw}' as the wake word (will respond to 'Hey Clover')")
-                        break
-                else:
-                    # If all else fails, use the first available keyword
-                    processed_keywords = [available_keywords[0]]
-                    logger.info(f"Using '{available_keywords[0]}' as the wake word (will respond to 'Hey Clover')")
+            processed_keywords = [_pick_wake_keyword()]
 
             # Store the original keywords and processed keywords for callback purposes
             self.original_keywords = self.keywords
             self.processed_keywords = processed_keywords
 
-            # Create Porcupine instance
-            sensitivities = [self.sensitivity] * len(processed_keywords)
+            # Create Porcupine instance, reusing one a stopped detector left behind
+            self._porcupine_key = (self.access_key, tuple(processed_keywords), self.sensitivity)
+            self.porcupine = _acquire_porcupine(self._porcupine_key)
 
-            self.porcupine = pvporcupine.create(
-                access_key=self.access_key,
-                keywords=processed_keywords,
-                sensitivities=sensitivities
-            )
+            # Compile the frame format once instead of on every read. PyAudio
+            # delivers samples in native byte order; '=' keeps that order but
+            # fixes the sample size at two bytes on every platform. The samples
+            # are unpacked into a tuple on purpose: Porcupine's process() copies
+            # them one by one into a ctypes array, so an array.array would only
+            # create the same ints again there and in the silence check.
+            frame_format = struct.Struct(f"={self.porcupine.frame_length}h")
+            self._unpack_frame = frame_format.unpack_from
+            self._frame_bytes = frame_format.size
 
             # Initialize PyAudio
             self.pa = pyaudio.PyAudio()
 
-            # Open audio stream
+            # Open audio stream. PortAudio's own thread hands over each frame,
+            # so capture does not wait on the detection thread.
             self.audio_stream = self.pa.open(
                 rate=self.porcupine.sample_rate,
                 channels=1,
                 format=pyaudio.paInt16,
                 input=True,
-                frames_per_buffer=self.porcupine.frame_length
+                frames_per_buffer=self.porcupine.frame_length * FRAMES_PER_CALLBACK,
+                stream_callback=self._on_audio
             )
 
             logger.info(f"Custom wake word detector initialized with keywords: {self.keywords} (using: {processed_keywords})")
@@ -128,6 +223,13 @@ class CustomWakeWordDetector:
             if not self.initialize():
                 return False
 
+        # Drop audio and stop signals left over from an earlier run
+        try:
+            while True:
+                self._buffers.get_nowait()
+        except queue.Empty:
+            pass
+
         self.is_running = True
         self.thread = threading.Thread(target=self._detection_loop)
         self.thread.daemon = True
@@ -135,69 +237,246 @@ class CustomWakeWordDetector:
         logger.info("Custom wake word detection started")
         return True
 
+    def share_stream(self, other: "CustomWakeWordDetector") -> None:
+        """
+        Feed another initialized detector from this detector's audio stream.
+
+        The other detector closes its own microphone stream and runs no thread
+        of its own; every frame read here is also passed to its Porcupine
+        instance. Both detectors must use the same sample rate and frame length.
+        """
+        other.close_audio()
+        other.leader = self
+        other.is_running = True
+        self.followers += (other,)
+
     def stop(self) -> None:
         """Stop wake word detection"""
-        self.is_running = False
+        # Taking the lock waits for a leader that is still passing a frame to
+        # this detector; once is_running is False it skips this detector
+        with self._cleanup_lock:
+            self.is_running = False
+        if self.leader:
+            self.leader.followers = tuple(f for f in self.leader.followers if f is not self)
+            self.leader = None
         if self.thread and self.thread.is_alive():
+            # Wake the detection thread now rather than at the next frame
+            self._put_buffer(None)
             self.thread.join(timeout=2.0)
-        self.cleanup()
-        logger.info("Custom wake word detection stopped")
+        if self._event_thread:
+            self._events.put(None)
+            self._event_thread = None
 
-    def cleanup(self) -> None:
-        """Clean up resources"""
-        if self.audio_stream:
-            self.audio_stream.stop_stream()
-            self.audio_stream.close()
-            self.audio_stream = None
+        # The detection thread cleans up when it exits; only free Porcupine
+        # and the stream here if it is not still using them
+        if self.thread and self.thread.is_alive():
+            logger.warning("Wake word detection thread is still busy; it will clean up when it exits")
+        else:
+            self.cleanup()
+        logger.info("Custom wake word detection stopped")
 
-        if self.pa:
-            self.pa.terminate()
-            self.pa = None
+    def close_audio(self) -> None:
+        """Close the audio stream and PyAudio instance"""
+        with self._cleanup_lock:
+            # Forget each handle before releasing it, so a failed release is
+            # never retried and does not keep the rest from being released
+            stream, self.audio_stream = self.audio_stream, None
+            if stream:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception as e:
+                    logger.warning(f"Error closing wake word audio stream: {e}")
+
+            pa, self.pa = self.pa, None
+            if pa:
+                try:
+                    pa.terminate()
+                except Exception as e:
+                    logger.warning(f"Error terminating PyAudio: {e}")
 
-        if self.porcupine:
-            self.porcupine.delete()
-            self.porcupine = None
+    def cleanup(self) -> None:
+        """Clean up resources (safe to call more than once)"""
+        with self._cleanup_lock:
+            self.close_audio()
+
+            porcupine, self.porcupine = self.porcupine, None
+            if porcupine:
+                try:
+                    _release_porcupine(self._porcupine_key, porcupine)
+                except Exception as e:
+                    logger.warning(f"Error releasing Porcupine: {e}")
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """Queue a buffer from the audio stream (called on PortAudio's thread)"""
+        if status & pyaudio.paInputOverflow:
+            self.input_overflows += 1
+        self._put_buffer(in_data)
+        return (None, pyaudio.paContinue)
+
+    def _put_buffer(self, buffer: Optional[bytes]) -> None:
+        """Queue audio for the detection thread, dropping the oldest if it is behind"""
+        try:
+            self._buffers.put_nowait(buffer)
+        except queue.Full:
+            try:
+                dropped = self._buffers.get_nowait()
+                if dropped:
+                    self.dropped_frames += len(dropped) // self._frame_bytes
+            except queue.Empty:
+                pass
+            try:
+                self._buffers.put_nowait(buffer)
+            except queue.Full:
+                # The other producer (the PortAudio callback or stop()) refilled
+                # the freed slot first. Drop this buffer instead: a full queue
+                # wakes the detection thread anyway, and it checks is_running,
+                # so even a lost stop sentinel still ends the loop.
+                if buffer:
+                    self.dropped_frames += len(buffer) // self._frame_bytes
 
     def _detection_loop(self) -> None:
         """Main detection loop"""
+        _raise_thread_priority()
+
         try:
+            # Look these up once rather than on every frame
+            get_buffer = self._buffers.get
+            frame_bytes = self._frame_bytes
+            unpack_frame = self._unpack_frame
+            dispatch_frame = self._dispatch_frame
+
+            # Silent frames held back in case speech follows them, and how
+            # many more frames to check after the last loud one
+            preroll = deque(maxlen=PREROLL_FRAMES)
+            hangover = 0
+            ambient = []  # Loudest sample of each frame while calibrating
+            reported_drops = self.dropped_frames
+            reported_overflows = self.input_overflows
+            next_drop_report = 0.0
+
             while self.is_running:
-                # Read audio frame
-                pcm = self.audio_stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
-
-                # Process with Porcupine
-                keyword_index = self.porcupine.process(pcm)
-
-                # If wake word detected
-                if keyword_index >= 0:
-                    # Always use "hey clover" as the detected keyword for user experience
-                    detected_keyword = "hey clover"
-                    actual_keyword = self.processed_keywords[keyword_index] if keyword_index < len(self.processed_keywords) else "unknown"
-                    logger.info(f"Wake word detected: {actual_keyword} (responding as '{detected_keyword}')")
-
-                    # Print a clear message to the console
-                    print(f"\n>>> Wake word '{actual_keyword}' detected! Responding as 'Hey Clover'...\n")
-
-                    # Call the callback function if provided
-                    if self.callback:
-                        self.callback(detected_keyword)
+                # Wait for the next audio buffer; stop() sends None
+                buffer = get_buffer()
+                if buffer is None:
+                    break
+
+                # Warn, now and then, when audio was lost on the way here
+                if ((self.dropped_frames != reported_drops or self.input_overflows != reported_overflows)
+                        and time.monotonic() >= next_drop_report):
+                    logger.warning(f"Wake word detection fell behind; dropped {self.dropped_frames - reported_drops} "
+                                   f"audio frames, {self.input_overflows - reported_overflows} input overflows")
+                    reported_drops = self.dropped_frames
+                    reported_overflows = self.input_overflows
+                    next_drop_report = time.monotonic() + DROP_REPORT_INTERVAL
+
+                # Check every frame in the buffer, unpacking each in place
+                for offset in range(0, len(buffer), frame_bytes):
+                    pcm = unpack_frame(buffer, offset)
+
+                    # Skip Porcupine while the microphone only hears silence
+                    peak = max(max(pcm), -min(pcm))
+                    if len(ambient) < CALIBRATION_FRAMES:
+                        ambient.append(peak)
+                        if len(ambient) == CALIBRATION_FRAMES:
+                            self._calibrate_silence(ambient)
+
+                    if peak >= self.silence_threshold:
+                        hangover = HANGOVER_FRAMES
+                        while preroll:
+                            dispatch_frame(preroll.popleft())
+                    elif hangover:
+                        hangover -= 1
+                    else:
+                        preroll.append(pcm)
+                        continue
+
+                    dispatch_frame(pcm)
         except Exception as e:
             logger.error(f"Error in custom wake word detection loop: {e}")
             self.is_running = False
         finally:
+            for follower in self.followers:
+                follower.is_running = False
             self.cleanup()
 
-def get_available_keywords() -> List[str]:
-    """Get list of available built-in keywords"""
+    def _calibrate_silence(self, peaks: List[int]) -> None:
+        """Raise the silence threshold above the microphone's background noise"""
+        if not self.silence_threshold:
+            return
+
+        # The median ignores anyone who happened to speak while measuring
+        noise = sorted(peaks)[len(peaks) // 2]
+        threshold = min(max(self.silence_threshold, 2 * noise), MAX_SILENCE_THRESHOLD)
+        if threshold != self.silence_threshold:
+            logger.info(f"Silence threshold set to {threshold} for background noise level {noise}")
+            self.silence_threshold = threshold
+
+    def _dispatch_frame(self, pcm) -> None:
+        """Process a frame with Porcupine, then with any detectors sharing this stream"""
+        self.process_frame(pcm)
+        # The tuple is swapped rather than changed, so no copy is needed per frame
+        for follower in self.followers:
+            # A follower stops and frees its Porcupine from another thread, so
+            # hold its lock while using it
+            with follower._cleanup_lock:
+                if follower.is_running and follower.porcupine:
+                    follower.process_frame(pcm)
+
+    def process_frame(self, pcm) -> None:
+        """Check one frame of audio samples for the wake word"""
+        keyword_index = self.porcupine.process(pcm)
+
+        # If wake word detected, report it from another thread so reading
+        # audio is never held up by the console or the callback
+        if keyword_index >= 0:
+            if self._event_thread is None:
+                self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
+                self._event_thread.start()
+            self._events.put(keyword_index)
+
+    def _event_loop(self) -> None:
+        """Announce each detected wake word and call the callback"""
+        while True:
+            keyword_index = self._events.get()
+            if keyword_index is None:
+                return
+
+            # Always use "hey clover" as the detected keyword for user experience
+            detected_keyword = "hey clover"
+            actual_keyword = self.processed_keywords[keyword_index] if keyword_index < len(self.processed_keywords) else "unknown"
+            logger.info(f"Wake word detected: {actual_keyword} (responding as '{detected_keyword}')")
+
+            # Print a clear message to the console
+            print(f"\n>>> Wake word '{actual_keyword}' detected! Responding as 'Hey Clover'...\n")
+
+            # Call the callback function if provided
+            if self.callback:
+                try:
+                    self.callback(detected_keyword)
+                except Exception as e:
+                    logger.error(f"Error in wake word callback: {e}")
+
+            # Drop detections made while the callback ran, such as the
+            # assistant hearing its own reply
+            try:
+                while True:
+                    if self._events.get_nowait() is None:
+                        return
+            except queue.Empty:
+                pass
+
+@functools.lru_cache(maxsize=None)
+def get_available_keywords() -> Tuple[str, ...]:
+    """Get the available built-in keywords (computed once and shared, so a tuple)"""
     try:
-        keywords = pvporcupine.KEYWORDS
+        keywords = tuple(sorted(pvporcupine.KEYWORDS))
         # Add "hey clover" to the list if it's available in the future
         if "hey clover" not in keywords:
-            keywords.append("hey clover")  # This is just for display purposes
+            keywords += ("hey clover",)  # This is just for display purposes
         return keywords
-    except:
-        return ["jarvis", "computer", "alexa", "hey siri", "ok google", "hey clover"]
+    except Exception:
+        return ("jarvis", "computer", "alexa", "hey siri", "ok google", "hey clover")
 
 def create_custom_wake_word_detector(keywords=["hey clover"], access_key=None, sensitivity=0.5, callback=None) -> Optional[CustomWakeWordDetector]:
     """
@@ -1,17 +1,35 @@
 import pyttsx3
 import speech_recognition as sr
 import datetime
-import wikipedia
-import webbrowser
+import importlib
 import os
-import smtplib
 import json
-import requests
+import re
 import logging
 import time
 import threading
+import queue
+import heapq
+import itertools
+import difflib
+import locale
+import atexit
+import hashlib
+import concurrent.futures
+from collections import deque
 from typing import Optional, Dict, List, Any, Callable
 
+# wikipedia, webbrowser, smtplib and requests are slow to import and only
+# needed by some commands, so they are imported on first use
+_MODS = {}
+
+def _lazy_import(name: str):
+    """Import a module on first use"""
+    module = _MODS.get(name)
+    if module is None:
+        module = _MODS[name] = importlib.import_module(name)
+    return module
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,13 +41,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optional: end recordings as soon as the speaker stops, using WebRTC voice
+# activity detection instead of the recognizer's energy threshold
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+# Optional (Windows only): play pre-synthesized recordings of fixed prompts
+try:
+    import winsound
+    WINSOUND_AVAILABLE = True
+except ImportError:
+    WINSOUND_AVAILABLE = False
+
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30  # webrtcvad accepts 10, 20 or 30 ms frames
+VAD_END_SILENCE_MS = 400  # Silence that ends a phrase
+VAD_PREROLL_MS = 300  # Audio kept from just before speech starts
+
+# Longest the reminder thread sleeps between checks, so a change to the
+# system clock delays a reminder by at most this many seconds
+REMINDER_MAX_SLEEP = 60
+
+# Prompts the assistant says often enough to keep recordings of
+FIXED_PROMPTS = frozenset((
+    "Good Morning!",
+    "Good Afternoon!",
+    "Good Evening!",
+    "I am your voice assistant. How may I help you?",
+    "Searching Wikipedia...",
+    "According to Wikipedia",
+    "Playing music",
+    "Who would you like to send an email to?",
+    "What should I say?",
+    "Email has been sent!",
+    "Which city would you like to know the weather for?",
+    "What would you like me to remind you about?",
+    "When should I remind you? Please specify the time.",
+    "What would you like me to note down?",
+    "I've made a note of that",
+    "I'm not sure how to help with that",
+))
+PROMPT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hey-clover", "prompts")
+
+MUSIC_EXTENSIONS = ('.mp3', '.wav', '.flac', '.m4a', '.ogg')
+
+# Seconds between measurements of background noise in take_command. The
+# recognizer keeps adjusting its threshold while it listens in between.
+AMBIENT_NOISE_INTERVAL = 300
+
+HTTP_TIMEOUT = 3  # Seconds to wait for a web API before giving up
+SMTP_TIMEOUT = 15  # Seconds to wait for the mail server
+
+WEATHER_CACHE_TTL = 15 * 60  # Seconds a city's weather report is reused
+WIKIPEDIA_CACHE_TTL = 24 * 60 * 60  # Seconds a Wikipedia summary is reused
+
+# Recent network lookups: (kind, key) -> (value, expires_at)
+_lookup_cache: Dict[tuple, tuple] = {}
+_lookup_cache_lock = threading.Lock()
+
+def cached_lookup(kind: str, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+    """
+    Return the value cached under (kind, key), calling fetch() on a miss or when it has expired.
+
+    Empty results such as None are returned but not cached, so failures are retried.
+    """
+    now = time.monotonic()
+    with _lookup_cache_lock:
+        entry = _lookup_cache.get((kind, key))
+    if entry and entry[1] > now:
+        return entry[0]
+
+    value = fetch()
+    if value:
+        with _lookup_cache_lock:
+            _lookup_cache[(kind, key)] = (value, now + ttl)
+    return value
+
+def query_tokens(query: str) -> frozenset:
+    """Split a query into the set of lowercase words it contains"""
+    return frozenset(query.lower().split())
+
+def tail_lines(path: str, count: int, block_size: int = 8192) -> List[str]:
+    """Return the last count non-empty lines of a text file without reading all of it"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        window = block_size
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            lines = [line for line in f.read(size - start).splitlines() if line.strip()]
+            # The first line may be cut off unless the window reaches the start of the file
+            if start == 0 or len(lines) > count:
+                break
+            window *= 2
+    encoding = locale.getpreferredencoding(False)
+    return [line.decode(encoding, errors='replace') for line in lines[-count:]]
+
 class Command:
     """Base class for all commands"""
+    # Phrases one of which must appear in the query for matches() to succeed,
+    # or None if the command does not declare any
+    triggers = None
+
     def __init__(self, assistant):
         self.assistant = assistant
     
-    def matches(self, query: str) -> bool:
-        """Check if this command matches the query"""
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
+        """
+        Check if this command matches the query.
+
+        tokens is the query_tokens() of the query, computed once by the caller;
+        commands that need it should call query_tokens() themselves when it is None.
+        """
         raise NotImplementedError("Subclasses must implement matches()")
     
     def execute(self, query: str) -> bool:
@@ -38,14 +164,17 @@ class Command:
 
 class WikipediaCommand(Command):
     """Search Wikipedia"""
-    def matches(self, query: str) -> bool:
+    triggers = ('wikipedia',)
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'wikipedia' in query
     
     def execute(self, query: str) -> bool:
         self.assistant.speak('Searching Wikipedia...')
-        query = query.replace("wikipedia", "")
+        query = " ".join(query.replace("wikipedia", "").split())
         try:
-            results = wikipedia.summary(query, sentences=2)
+            results = cached_lookup('wikipedia', query, WIKIPEDIA_CACHE_TTL,
+                                    lambda: _lazy_import("wikipedia").summary(query, sentences=2))
             self.assistant.speak("According to Wikipedia")
             print(results)
             self.assistant.speak(results)
@@ -66,15 +195,16 @@ class WebBrowserCommand(Command):
             'github': 'github.com',
             'mail': 'mail.google.com'
         }
+        self.triggers = tuple(f'open {site}' for site in self.sites)
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return any(f'open {site}' in query for site in self.sites.keys())
     
     def execute(self, query: str) -> bool:
         for site, url in self.sites.items():
             if f'open {site}' in query:
                 try:
-                    webbrowser.open(url)
+                    _lazy_import("webbrowser").open(url)
                     self.assistant.speak(f"Opening {site}")
                     return True
                 except Exception as e:
@@ -85,8 +215,35 @@ class WebBrowserCommand(Command):
 
 class MusicCommand(Command):
     """Play music"""
-    def matches(self, query: str) -> bool:
+    triggers = ('play music',)
+
+    def __init__(self, assistant):
+        super().__init__(assistant)
+        # Sorted music file names, rebuilt when the directory changes
+        self._music_index: List[str] = []
+        self._music_index_key = None
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'play music' in query
+
+    def get_songs(self, music_dir: str) -> List[str]:
+        """Return the music files in music_dir, rescanning only when it has changed"""
+        key = (music_dir, os.stat(music_dir).st_mtime_ns)
+        if key != self._music_index_key:
+            with os.scandir(music_dir) as entries:
+                self._music_index = sorted(entry.name for entry in entries
+                                           if entry.name.lower().endswith(MUSIC_EXTENSIONS) and entry.is_file())
+            self._music_index_key = key
+        return self._music_index
+
+    def pick_song(self, songs: List[str], title: str) -> str:
+        """Pick the song whose name is closest to title, or the first song"""
+        if title:
+            names = {os.path.splitext(song)[0].lower(): song for song in songs}
+            close = difflib.get_close_matches(title, names, n=1, cutoff=0.4)
+            if close:
+                return names[close[0]]
+        return songs[0]
     
     def execute(self, query: str) -> bool:
         music_dir = self.assistant.config['paths'].get('music_dir', '')
@@ -95,12 +252,14 @@ class MusicCommand(Command):
             return False
         
         try:
-            songs = os.listdir(music_dir)
+            songs = self.get_songs(music_dir)
             if not songs:
                 self.assistant.speak("No music files found in the specified directory")
                 return False
             
-            os.startfile(os.path.join(music_dir, songs[0]))
+            # "play music <title>" picks the closest matching song
+            title = query.split('play music', 1)[1].strip()
+            os.startfile(os.path.join(music_dir, self.pick_song(songs, title)))
             self.assistant.speak("Playing music")
             return True
         except Exception as e:
@@ -110,7 +269,9 @@ class MusicCommand(Command):
 
 class TimeCommand(Command):
     """Tell the time"""
-    def matches(self, query: str) -> bool:
+    triggers = ('the time',)
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'the time' in query
     
     def execute(self, query: str) -> bool:
@@ -120,7 +281,9 @@ class TimeCommand(Command):
 
 class EmailCommand(Command):
     """Send email"""
-    def matches(self, query: str) -> bool:
+    triggers = ('email', 'send mail')
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'email' in query or 'send mail' in query
     
     def execute(self, query: str) -> bool:
@@ -184,44 +347,58 @@ class EmailCommand(Command):
 
 class WeatherCommand(Command):
     """Get weather information"""
-    def matches(self, query: str) -> bool:
+    triggers = ('weather',)
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'weather' in query
     
     def execute(self, query: str) -> bool:
-        # Check if a city is mentioned in the query
-        city = None
+        # Check if cities are mentioned in the query ("weather in london and paris")
+        cities = []
         query_words = query.split()
         for i, word in enumerate(query_words):
             if word == 'in' and i < len(query_words) - 1:
-                city = query_words[i + 1]
+                cities.append(query_words[i + 1])
+                i += 2
+                while i < len(query_words) - 1 and query_words[i] == 'and':
+                    cities.append(query_words[i + 1])
+                    i += 2
                 break
         
-        if not city:
+        if not cities:
             self.assistant.speak("Which city would you like to know the weather for?")
             city_response = self.assistant.take_command()
             if city_response:
-                city = city_response.split()[0]  # Take the first word as the city
+                cities.append(city_response.split()[0])  # Take the first word as the city
             else:
                 return False
         
-        weather_info = self.assistant.get_weather(city)
-        if weather_info:
-            self.assistant.speak(weather_info)
-            return True
-        else:
-            self.assistant.speak(f"Sorry, I couldn't get the weather information for {city}")
-            return False
+        handled = False
+        for city, weather_info in zip(cities, self.assistant.get_weather_many(cities)):
+            if weather_info:
+                self.assistant.speak(weather_info)
+                handled = True
+            else:
+                self.assistant.speak(f"Sorry, I couldn't get the weather information for {city}")
+        return handled
 
 class ReminderCommand(Command):
     """Set reminders"""
+    triggers = ('remind',)
+
     def __init__(self, assistant):
         super().__init__(assistant)
+        # Pending reminders as a heap of (time, sequence, reminder)
         self.reminders = []
+        self._reminder_ids = itertools.count()
+        self._reminders_lock = threading.Lock()
         self.reminder_thread = None
         self.stop_flag = threading.Event()
+        # Set to wake the checker early, e.g. when a sooner reminder is added
+        self._wakeup = threading.Event()
         self.start_reminder_checker()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'remind' in query or 'reminder' in query
     
     def execute(self, query: str) -> bool:
@@ -275,11 +452,10 @@ class ReminderCommand(Command):
             if reminder_time < now:
                 reminder_time += datetime.timedelta(days=1)
             
-            self.reminders.append({
-                'text': reminder_text,
-                'time': reminder_time,
-                'notified': False
-            })
+            reminder = {'text': reminder_text, 'time': reminder_time}
+            with self._reminders_lock:
+                heapq.heappush(self.reminders, (reminder_time, next(self._reminder_ids), reminder))
+            self._wakeup.set()
             
             time_str = reminder_time.strftime("%I:%M %p")
             self.assistant.speak(f"Okay, I'll remind you to {reminder_text} at {time_str}")
@@ -291,15 +467,16 @@ class ReminderCommand(Command):
             return False
     
     def list_reminders(self) -> bool:
-        if not self.reminders:
+        with self._reminders_lock:
+            reminders = [reminder for _, _, reminder in sorted(self.reminders)]
+        if not reminders:
             self.assistant.speak("You don't have any reminders set.")
             return True
         
         self.assistant.speak("Here are your reminders:")
-        for i, reminder in enumerate(self.reminders):
-            if not reminder['notified']:
-                time_str = reminder['time'].strftime("%I:%M %p")
-                self.assistant.speak(f"{i+1}. {reminder['text']} at {time_str}")
+        for i, reminder in enumerate(reminders):
+            time_str = reminder['time'].strftime("%I:%M %p")
+            self.assistant.speak(f"{i+1}. {reminder['text']} at {time_str}")
         
         return True
     
@@ -310,24 +487,44 @@ class ReminderCommand(Command):
             self.reminder_thread = threading.Thread(target=self.check_reminders)
             self.reminder_thread.daemon = True
             self.reminder_thread.start()
+
+    def stop_reminder_checker(self):
+        """Stop the reminder checker thread and wait for it to exit"""
+        self.stop_flag.set()
+        self._wakeup.set()
+        if self.reminder_thread and self.reminder_thread is not threading.current_thread():
+            self.reminder_thread.join(timeout=2.0)
     
     def check_reminders(self):
-        """Check for due reminders periodically"""
+        """Announce reminders as they fall due, sleeping until the next one"""
         while not self.stop_flag.is_set():
-            now = datetime.datetime.now()
-            for reminder in self.reminders:
-                if not reminder['notified'] and now >= reminder['time']:
-                    self.assistant.speak(f"Reminder: {reminder['text']}")
-                    reminder['notified'] = True
-            time.sleep(30)  # Check every 30 seconds
+            with self._reminders_lock:
+                self._wakeup.clear()
+                now = datetime.datetime.now()
+                due = []
+                while self.reminders and self.reminders[0][0] <= now:
+                    due.append(heapq.heappop(self.reminders)[2])
+                timeout = REMINDER_MAX_SLEEP
+                if self.reminders:
+                    timeout = min((self.reminders[0][0] - now).total_seconds(), timeout)
+
+            for reminder in due:
+                self.assistant.speak(f"Reminder: {reminder['text']}")
+            if not due:
+                self._wakeup.wait(timeout)
 
 class NoteCommand(Command):
     """Take notes"""
+    triggers = ('take a note', 'make a note', 'write this down', 'remember this')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.notes_file = "assistant_notes.txt"
+        # Opened on the first note and kept open, line buffered so every
+        # note reaches the file as soon as it is written
+        self._notes_fp = None
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return ('take a note' in query or 'make a note' in query or 
                 'write this down' in query or 'remember this' in query)
     
@@ -339,8 +536,10 @@ class NoteCommand(Command):
         
         try:
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.notes_file, "a") as f:
-                f.write(f"[{timestamp}] {note_text}\n")
+            if self._notes_fp is None:
+                self._notes_fp = open(self.notes_file, "a", buffering=1)
+                atexit.register(self._notes_fp.close)
+            self._notes_fp.write(f"[{timestamp}] {note_text}\n")
             
             self.assistant.speak("I've made a note of that")
             return True
@@ -351,11 +550,13 @@ class NoteCommand(Command):
 
 class ReadNotesCommand(Command):
     """Read saved notes"""
+    triggers = ('read',)
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.notes_file = "assistant_notes.txt"
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'read' in query and 'note' in query
     
     def execute(self, query: str) -> bool:
@@ -364,15 +565,14 @@ class ReadNotesCommand(Command):
                 self.assistant.speak("You don't have any saved notes yet.")
                 return True
             
-            with open(self.notes_file, "r") as f:
-                notes = f.readlines()
+            notes = tail_lines(self.notes_file, 5)  # The 5 most recent notes
             
             if not notes:
                 self.assistant.speak("You don't have any saved notes yet.")
                 return True
             
             self.assistant.speak("Here are your notes:")
-            for note in notes[-5:]:  # Read the 5 most recent notes
+            for note in notes:
                 self.assistant.speak(note.strip())
             
             return True
@@ -387,8 +587,37 @@ class VoiceAssistant:
             self.engine = pyttsx3.init('sapi5')
             self.voices = self.engine.getProperty('voices')
             self.engine.setProperty('voice', self.voices[0].id)
+
+            # One recognizer for every command, calibrated on first use. The
+            # speech is only sent for recognition once the speaker pauses, so
+            # keep that pause short without cutting off natural breaks.
+            self.recognizer = sr.Recognizer()
+            self.recognizer.pause_threshold = 0.8
+            self.recognizer.non_speaking_duration = 0.4
+            # Give up on a stalled recognition request instead of hanging
+            self.recognizer.operation_timeout = 10
+            self.vad = webrtcvad.Vad(2) if WEBRTCVAD_AVAILABLE else None
+            self._next_noise_check = 0.0
+
+            # Speech is played by a worker thread so the assistant can keep
+            # working while it talks; take_command waits for it to finish
+            self.tts_queue = queue.Queue()
+            # Fixed prompts still to be recorded, worked through while idle
+            self._prompts_to_record = deque(sorted(FIXED_PROMPTS) if WINSOUND_AVAILABLE else ())
+            threading.Thread(target=self._speech_worker, daemon=True).start()
+
+            # Reuse connections to web APIs instead of reconnecting per request;
+            # created on first use by http_session()
+            self._http = None
+            self._http_lock = threading.Lock()
+            # Logged-in SMTP connection kept between emails
+            self._smtp = None
+            self._smtp_lock = threading.Lock()
+            atexit.register(self._close_smtp)
+
             self.load_config()
             self.initialize_commands()
+            self.prewarm_weather()
             logger.info("Voice Assistant initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing Voice Assistant: {e}")
@@ -414,6 +643,7 @@ class VoiceAssistant:
                     'code_editor': ''
                 },
                 'weather_api_key': '',
+                'home_city': '',  # Weather fetched at startup, e.g. 'london'
                 'voice': 0,  # 0 for male, 1 for female
                 'wake_word': 'assistant'
             }
@@ -441,17 +671,98 @@ class VoiceAssistant:
             NoteCommand(self),
             ReadNotesCommand(self)
         ]
+        self.build_command_router()
         logger.info(f"Initialized {len(self.commands)} commands")
 
+    def build_command_router(self):
+        """Compile the trigger phrases of all commands into a single regex"""
+        owners = {}
+        self._untriggered = []
+        for index, command in enumerate(self.commands):
+            if command.triggers is None:
+                self._untriggered.append(index)
+            for phrase in command.triggers or ():
+                owners.setdefault(phrase, set()).add(index)
+
+        # Only the shortest phrase is reported where several start at the same
+        # position, so it stands in for the commands of the longer ones too
+        self._trigger_owners = {
+            phrase: set().union(*(owners[other] for other in owners if other.startswith(phrase)))
+            for phrase in owners
+        }
+        alternation = "|".join(re.escape(phrase) for phrase in sorted(owners, key=len))
+        self._trigger_pattern = re.compile(f"(?=({alternation}))") if owners else None
+
+    def route_command(self, query: str) -> list:
+        """Return the indices of the commands that may match, in priority order"""
+        candidates = set(self._untriggered)
+        if self._trigger_pattern:
+            for match in self._trigger_pattern.finditer(query):
+                candidates |= self._trigger_owners[match.group(1)]
+        return sorted(candidates)
+
     def speak(self, text: str) -> None:
-        """Convert text to speech"""
+        """Convert text to speech without waiting for it to be spoken"""
+        print(f"Assistant: {text}")
+        self.tts_queue.put(text)
+
+    def speak_sync(self, text: str) -> None:
+        """Convert text to speech and wait until everything queued has been spoken"""
+        self.speak(text)
+        self.tts_queue.join()
+
+    def set_voice(self, index: int) -> None:
+        """Switch to one of the installed voices once the speech queued before it has been spoken"""
+        voice_id = self.voices[index].id
+        # pyttsx3 engines are not thread-safe, so only the speech worker touches it
+        self.tts_queue.put(lambda: self.engine.setProperty('voice', voice_id))
+
+    def _speech_worker(self) -> None:
+        """Speak queued text, one item at a time, and apply queued engine changes"""
+        while True:
+            if self._prompts_to_record and self.tts_queue.empty():
+                self._record_prompt(self._prompts_to_record.popleft())
+                continue
+
+            text = self.tts_queue.get()
+            try:
+                if callable(text):
+                    text()
+                    continue
+
+                path = self._prompt_path(text) if WINSOUND_AVAILABLE and text in FIXED_PROMPTS else None
+                if path and os.path.exists(path):
+                    winsound.PlaySound(path, winsound.SND_FILENAME)
+                else:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+                    if path and text not in self._prompts_to_record:
+                        # Recorded for a different voice or rate; record it again
+                        self._prompts_to_record.append(text)
+            except Exception as e:
+                logger.error(f"Error in speech synthesis: {e}")
+                print(f"Error in speech synthesis: {e}")
+            finally:
+                self.tts_queue.task_done()
+
+    def _prompt_path(self, text: str) -> str:
+        """Path of the recording of a fixed prompt in the current voice"""
+        key = f"{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}|{text}"
+        return os.path.join(PROMPT_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".wav")
+
+    def _record_prompt(self, text: str) -> None:
+        """Synthesize a fixed prompt to a WAV file so later uses skip the synthesizer"""
         try:
-            print(f"Assistant: {text}")
-            self.engine.say(text)
+            path = self._prompt_path(text)
+            if os.path.exists(path):
+                return
+            os.makedirs(PROMPT_CACHE_DIR, exist_ok=True)
+            part_path = path + ".part"
+            self.engine.save_to_file(text, part_path)
             self.engine.runAndWait()
+            os.replace(part_path, path)
         except Exception as e:
-            logger.error(f"Error in speech synthesis: {e}")
-            print(f"Error in speech synthesis: {e}")
+            logger.error(f"Error recording prompt: {e}")
 
     def wish_me(self) -> None:
         """Greet user based on time of day"""
@@ -466,17 +777,31 @@ class VoiceAssistant:
 
     def take_command(self) -> Optional[str]:
         """Take microphone input and return string output"""
-        r = sr.Recognizer()
+        # Never listen while the assistant is still talking
+        self.tts_queue.join()
+
+        r = self.recognizer
         try:
-            with sr.Microphone() as source:
-                print("Listening...")
-                r.pause_threshold = 1
-                r.adjust_for_ambient_noise(source)
-                audio = r.listen(source, timeout=5, phrase_time_limit=10)
-                print("Processing...")
-                query = r.recognize_google(audio, language='en-in')
-                print(f"User said: {query}\n")
-                return query.lower()
+            if self.vad:
+                with sr.Microphone(sample_rate=VAD_SAMPLE_RATE,
+                                   chunk_size=VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000) as source:
+                    print("Listening...")
+                    audio = self._listen_vad(source, timeout=5, phrase_time_limit=10)
+            else:
+                with sr.Microphone() as source:
+                    # Measuring the room takes a second, so only do it now and then
+                    now = time.monotonic()
+                    if now >= self._next_noise_check:
+                        r.adjust_for_ambient_noise(source)
+                        self._next_noise_check = now + AMBIENT_NOISE_INTERVAL
+                    print("Listening...")
+                    audio = r.listen(source, timeout=5, phrase_time_limit=10)
+
+            # The microphone is closed again before the recording is sent off
+            print("Processing...")
+            query = r.recognize_google(audio, language='en-in')
+            print(f"User said: {query}\n")
+            return query.lower()
         except sr.WaitTimeoutError:
             print("No speech detected within timeout")
             return None
@@ -491,31 +816,117 @@ class VoiceAssistant:
             print(f"Error in speech recognition: {e}")
             return None
 
+    def _listen_vad(self, source, timeout: float, phrase_time_limit: float) -> sr.AudioData:
+        """Record one phrase, ending it as soon as voice activity detection hears silence"""
+        frames_per_second = 1000 // VAD_FRAME_MS
+        end_frames = VAD_END_SILENCE_MS // VAD_FRAME_MS
+        preroll = deque(maxlen=VAD_PREROLL_MS // VAD_FRAME_MS)
+
+        # Wait for speech to start, keeping the audio just before it
+        for _ in range(int(timeout * frames_per_second)):
+            frame = source.stream.read(source.CHUNK)
+            if self.vad.is_speech(frame, source.SAMPLE_RATE):
+                break
+            preroll.append(frame)
+        else:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+        # Record until the speaker has been silent long enough
+        frames = list(preroll)
+        frames.append(frame)
+        silent = 0
+        max_frames = int(phrase_time_limit * frames_per_second)
+        while silent < end_frames and len(frames) < max_frames:
+            frame = source.stream.read(source.CHUNK)
+            frames.append(frame)
+            silent = 0 if self.vad.is_speech(frame, source.SAMPLE_RATE) else silent + 1
+
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
     def send_email(self, to: str, content: str) -> bool:
         """Send email using configured settings"""
+        with self._smtp_lock:
+            try:
+                server = self._smtp_connection()
+                server.sendmail(self.config['email']['sender'], to, content)
+                logger.info(f"Email sent successfully to {to}")
+                return True
+            except Exception as e:
+                logger.error(f"Error sending email: {e}")
+                # Start from a fresh connection next time
+                self._close_smtp()
+                return False
+
+    def _smtp_connection(self):
+        """Return the logged-in SMTP connection, reconnecting if it has been dropped"""
+        smtplib = _lazy_import("smtplib")
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+
+        server = smtplib.SMTP('smtp.gmail.com', 587, timeout=SMTP_TIMEOUT)
         try:
-            server = smtplib.SMTP('smtp.gmail.com', 587)
             server.ehlo()
             server.starttls()
             server.login(self.config['email']['sender'], self.config['email']['password'])
-            server.sendmail(self.config['email']['sender'], to, content)
+        except Exception:
             server.close()
-            logger.info(f"Email sent successfully to {to}")
-            return True
-        except Exception as e:
-            logger.error(f"Error sending email: {e}")
-            return False
+            raise
+        self._smtp = server
+        return server
+
+    def _close_smtp(self) -> None:
+        """Log out of the SMTP server if connected"""
+        server, self._smtp = self._smtp, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
 
     def get_weather(self, city: str) -> Optional[str]:
-        """Get weather information for a city"""
+        """Get weather information for a city, reusing recent reports"""
+        api_key = self.config.get('weather_api_key', '')
+        if not api_key:
+            self.speak("Weather API key is not configured")
+            return None
+
+        return cached_lookup('weather', city.strip().lower(), WEATHER_CACHE_TTL,
+                             lambda: self._fetch_weather(city, api_key))
+
+    def http_session(self):
+        """Return the shared requests.Session, creating it on first use"""
+        with self._http_lock:
+            if self._http is None:
+                requests = _lazy_import("requests")
+                self._http = requests.Session()
+                self._http.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+            return self._http
+
+    def get_weather_many(self, cities: List[str]) -> List[Optional[str]]:
+        """Get weather information for several cities at once, in the order given"""
+        if len(cities) <= 1 or not self.config.get('weather_api_key', ''):
+            return [self.get_weather(city) for city in cities]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(cities), 8)) as executor:
+            return list(executor.map(self.get_weather, cities))
+
+    def prewarm_weather(self) -> None:
+        """Fetch the home city's weather in the background so the first query is instant"""
+        city = self.config.get('home_city', '')
+        if city and self.config.get('weather_api_key', ''):
+            threading.Thread(target=self.get_weather, args=(city,), daemon=True).start()
+
+    def _fetch_weather(self, city: str, api_key: str) -> Optional[str]:
+        """Ask OpenWeatherMap for the current weather in a city"""
         try:
-            api_key = self.config.get('weather_api_key', '')
-            if not api_key:
-                self.speak("Weather API key is not configured")
-                return None
-                
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-            response = requests.get(url)
+            url = "https://api.openweathermap.org/data/2.5/weather"
+            params = {'q': city, 'appid': api_key, 'units': 'metric'}
+            response = self.http_session().get(url, params=params, timeout=HTTP_TIMEOUT)
             data = response.json()
             if response.status_code == 200:
                 temp = data['main']['temp']
@@ -532,9 +943,12 @@ class VoiceAssistant:
     def process_command(self, query: str) -> None:
         """Process user commands"""
         try:
-            # Check if any command matches and can handle the query
-            for command in self.commands:
-                if command.matches(query):
+            # Check the commands whose trigger phrases appear in the query,
+            # in the order they were added
+            tokens = query_tokens(query)
+            for index in self.route_command(query):
+                command = self.commands[index]
+                if command.matches(query, tokens):
                     if command.execute(query):
                         return
             
@@ -554,13 +968,13 @@ class VoiceAssistant:
         voice_choice = self.take_command()
         if voice_choice and ('female' in voice_choice or 'woman' in voice_choice):
             if len(self.voices) > 1:
-                self.engine.setProperty('voice', self.voices[1].id)
+                self.set_voice(1)
                 self.config['voice'] = 1
                 self.speak("Female voice selected")
             else:
                 self.speak("Sorry, female voice is not available on your system")
         else:
-            self.engine.setProperty('voice', self.voices[0].id)
+            self.set_voice(0)
             self.config['voice'] = 0
             self.speak("Male voice selected")
         
@@ -597,27 +1011,41 @@ class VoiceAssistant:
         self.save_config()
         self.speak("Configuration complete")
 
+    def set_reminders_running(self, running: bool) -> None:
+        """Start or stop the reminder checker threads"""
+        for command in self.commands:
+            if isinstance(command, ReminderCommand):
+                if running:
+                    command.start_reminder_checker()
+                else:
+                    command.stop_reminder_checker()
+
     def run(self):
         """Main loop for the voice assistant"""
-        self.wish_me()
-        
-        # Check if this is the first run or if configuration is incomplete
-        if not self.config['email']['sender'] or not self.config['weather_api_key']:
-            self.speak("It looks like your assistant is not fully configured. Would you like to set it up now?")
-            setup_response = self.take_command()
-            if setup_response and ('yes' in setup_response or 'sure' in setup_response):
-                self.configure_assistant()
-        
-        while True:
-            query = self.take_command()
-            if query:
-                if 'exit' in query or 'quit' in query or 'goodbye' in query:
-                    self.speak("Goodbye! Have a great day!")
-                    break
-                elif 'configure' in query or 'setup' in query:
+        # Restart reminders in case an earlier run() stopped them
+        self.set_reminders_running(True)
+        try:
+            self.wish_me()
+            
+            # Check if this is the first run or if configuration is incomplete
+            if not self.config['email']['sender'] or not self.config['weather_api_key']:
+                self.speak("It looks like your assistant is not fully configured. Would you like to set it up now?")
+                setup_response = self.take_command()
+                if setup_response and ('yes' in setup_response or 'sure' in setup_response):
                     self.configure_assistant()
-                else:
-                    self.process_command(query)
+            
+            while True:
+                query = self.take_command()
+                if query:
+                    if 'exit' in query or 'quit' in query or 'goodbye' in query:
+                        self.speak_sync("Goodbye! Have a great day!")
+                        break
+                    elif 'configure' in query or 'setup' in query:
+                        self.configure_assistant()
+                    else:
+                        self.process_command(query)
+        finally:
+            self.set_reminders_running(False)
 
 if __name__ == "__main__":
     try:
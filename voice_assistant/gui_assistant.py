@@ -15,7 +15,7 @@ from PIL import Image, ImageTk
 import enhanced_voice_assistant as va
 
 class AssistantGUI:
-    def __init__(self, root):
+    def __init__(self, root, assistant=None):
         self.root = root
         self.root.title("Voice Assistant")
         self.root.geometry("800x600")
@@ -65,8 +65,8 @@ class AssistantGUI:
         # Start checking the message queue
         self.check_queue()
         
-        # Initialize the assistant
-        self.initialize_assistant()
+        # Initialize the assistant, or take over one that is already running
+        self.initialize_assistant(assistant)
     
     def create_widgets(self):
         """Create all GUI widgets"""
@@ -137,13 +137,13 @@ class AssistantGUI:
         )
         self.exit_button.pack(side=tk.RIGHT)
     
-    def initialize_assistant(self):
+    def initialize_assistant(self, assistant=None):
         """Initialize the voice assistant in a separate thread"""
         def init_thread():
             try:
                 self.update_status("Initializing...", "orange")
                 self.add_message("System", "Initializing voice assistant...")
-                self.assistant = va.VoiceAssistant()
+                self.assistant = assistant or va.VoiceAssistant()
                 
                 # Override the speak method to update the GUI
                 original_speak = self.assistant.speak
@@ -339,9 +339,8 @@ class AssistantGUI:
                 # Save to file
                 self.assistant.save_config()
                 
-                # Update voice if needed
-                if self.assistant.engine.getProperty('voice') != self.assistant.voices[self.assistant.config['voice']].id:
-                    self.assistant.engine.setProperty('voice', self.assistant.voices[self.assistant.config['voice']].id)
+                # Update voice
+                self.assistant.set_voice(self.assistant.config['voice'])
                 
                 messagebox.showinfo("Settings Saved", "Your settings have been saved successfully.")
                 settings_window.destroy()
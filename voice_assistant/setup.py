@@ -9,6 +9,7 @@ import subprocess
 import os
 import json
 import sys
+import compileall
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -57,6 +58,16 @@ def create_default_config():
     else:
         print("Configuration file already exists.")
 
+def precompile_bytecode():
+    """Compile the assistant modules to .pyc so the first launch doesn't have to"""
+    print("Precompiling Python modules...")
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if compileall.compile_dir(script_dir, maxlevels=0, quiet=1, workers=0):
+        print("Modules precompiled successfully!")
+        return True
+    print("Some modules could not be precompiled; they will be compiled on first import.")
+    return False
+
 def main():
     """Main setup function"""
     print("=" * 50)
@@ -68,6 +79,7 @@ def main():
     
     if install_dependencies():
         create_default_config()
+        precompile_bytecode()
         print("\nSetup completed successfully!")
         print("You can now run the voice assistant using:")
         print("  - python main.py")
@@ -20,11 +20,13 @@ logger = logging.getLogger(__name__)
 
 class VolumeCommand(Command):
     """Control system volume"""
+    triggers = ('volume', 'louder', 'quieter', 'mute')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return ('volume' in query or 
                 'louder' in query or 
                 'quieter' in query or 
@@ -96,11 +98,13 @@ class VolumeCommand(Command):
 
 class BrightnessCommand(Command):
     """Control screen brightness"""
+    triggers = ('brightness', 'screen')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'brightness' in query or 'screen' in query
     
     def execute(self, query: str) -> bool:
@@ -130,11 +134,13 @@ class BrightnessCommand(Command):
 
 class PowerCommand(Command):
     """Control power functions (shutdown, restart, sleep)"""
+    triggers = ('shutdown', 'restart', 'reboot', 'sleep', 'lock', 'log off', 'sign out', 'turn off computer')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return ('shutdown' in query or 
                 'restart' in query or 
                 'reboot' in query or 
@@ -238,11 +244,13 @@ class PowerCommand(Command):
 
 class ScreenshotCommand(Command):
     """Take screenshots"""
+    triggers = ('screenshot', 'capture screen', 'screen capture')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return 'screenshot' in query or 'capture screen' in query or 'screen capture' in query
     
     def execute(self, query: str) -> bool:
@@ -258,11 +266,13 @@ class ScreenshotCommand(Command):
 
 class ApplicationCommand(Command):
     """Launch and close applications"""
+    triggers = ('open', 'launch', 'start', 'run', 'close', 'exit', 'quit')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return (('open' in query or 'launch' in query or 'start' in query or 'run' in query) or
                 ('close' in query or 'exit' in query or 'quit' in query))
     
@@ -323,11 +333,14 @@ class ApplicationCommand(Command):
 
 class SystemInfoCommand(Command):
     """Get system information"""
+    triggers = ('battery', 'power', 'cpu', 'processor', 'memory', 'ram', 'disk', 'storage', 'drive',
+                'network', 'internet', 'wifi', 'system')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return (('battery' in query or 'power' in query) or
                 ('cpu' in query or 'processor' in query or 'memory' in query or 'ram' in query) or
                 ('disk' in query or 'storage' in query or 'drive' in query) or
@@ -413,11 +426,13 @@ class SystemInfoCommand(Command):
 
 class FileCommand(Command):
     """File operations"""
+    triggers = ('find', 'search', 'locate', 'open', 'create', 'delete')
+
     def __init__(self, assistant):
         super().__init__(assistant)
         self.system = SystemControl()
     
-    def matches(self, query: str) -> bool:
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
         return (('find' in query or 'search' in query or 'locate' in query) and ('file' in query or 'document' in query)) or \
                (('open' in query or 'create' in query or 'delete' in query) and ('file' in query or 'folder' in query or 'directory' in query))
     
@@ -552,6 +567,38 @@ class FileCommand(Command):
         self.assistant.speak("I'm not sure what file operation you want to perform")
         return False
 
+class LazyCommand(Command):
+    """Stand-in that creates the real command the first time it is needed"""
+    def __init__(self, assistant, factory):
+        super().__init__(assistant)
+        self.factory = factory
+        self.triggers = factory.triggers
+        self.command = None
+
+    def _get_command(self) -> Command:
+        if self.command is None:
+            self.command = self.factory(self.assistant)
+        return self.command
+
+    def matches(self, query: str, tokens: Optional[frozenset] = None) -> bool:
+        return self._get_command().matches(query)
+
+    def execute(self, query: str) -> bool:
+        return self._get_command().execute(query)
+
+# Function to get the system command classes by name, without creating them
+def get_system_command_index() -> Dict[str, type]:
+    """Get all system command classes, keyed by name"""
+    return {
+        "volume": VolumeCommand,
+        "brightness": BrightnessCommand,
+        "power": PowerCommand,
+        "screenshot": ScreenshotCommand,
+        "application": ApplicationCommand,
+        "system_info": SystemInfoCommand,
+        "file": FileCommand
+    }
+
 # Function to get all system commands
 def get_system_commands(assistant):
     """Get all system command classes"""
@@ -24,15 +24,16 @@ class VoiceEnhancements:
     """
     Class to manage voice assistant enhancements
     """
-    def __init__(self, config_file: str = "voice_enhancements.json"):
+    def __init__(self, config_file: str = "voice_enhancements.json", config: Optional[Dict[str, Any]] = None):
         """
         Initialize voice enhancements.
 
         Args:
             config_file: Path to the configuration file
+            config: Configuration to use instead of reading config_file
         """
         self.config_file = config_file
-        self.config = self.load_config()
+        self.config = config if config is not None else self.load_config()
 
         self.wake_word_detector = None
         self.tts_engine = None
@@ -201,15 +202,18 @@ class VoiceEnhancements:
             return self.tts_engine.speak(text)
         return False
 
-    def get_available_voices(self) -> List[Dict[str, Any]]:
+    def get_available_voices(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get a list of available voices for the current TTS engine.
 
+        Args:
+            refresh: Fetch the list again instead of using the cached one
+
         Returns:
             list: List of available voices
         """
         if self.tts_engine:
-            return self.tts_engine.get_available_voices()
+            return self.tts_engine.get_available_voices(refresh)
         return []
 
     def set_voice(self, voice_id: str) -> bool: